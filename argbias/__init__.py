@@ -0,0 +1,8 @@
+"""
+Bias analysis for the Argument Annotated Essays dataset.
+
+Every analysis module is importable without side effects and exposes a
+``main()`` entry point, e.g. ``python -m argbias.biasquantification <dataset_path>``.
+Heavy dependencies (spaCy, TextBlob, pandas, matplotlib, seaborn, scipy) are
+only imported on first use, so importing the package stays fast.
+"""
@@ -0,0 +1,63 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, extract_named_entities, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Function to extract entities from one essay
+def process_essay(file, text_filepath, ann_filepath):
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_named_entities(ann["text"])
+        for entity, ent_type in entities:
+            rows.append({"Essay": file, "Label": ann["label"], "Entity": entity, "Type": ent_type})
+    return rows, len(annotations)
+
+# Function to process all essays in dataset
+def process_dataset(dataset_path, **run_kwargs):
+    results = run_essays(dataset_path, process_essay, "argbias.argumentbiasanalysis", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+# Function to visualize entity distribution
+def visualize_entity_distribution(df):
+    if df.empty:
+        print("No named entities found in the dataset.")
+        return
+    
+    plt.figure(figsize=(10, 5))
+    sns.countplot(data=df, x="Type", order=df["Type"].value_counts().index)
+    plt.title("Entity Distribution in Argument Components")
+    plt.xticks(rotation=45)
+    plt.show()
+
+# Function to analyze entity bias across argument types
+def analyze_entity_bias(df):
+    if df.empty:
+        print("No named entities found in the dataset.")
+        return
+    
+    plt.figure(figsize=(12, 6))
+    sns.countplot(data=df, x="Type", hue="Label", order=df["Type"].value_counts().index)
+    plt.title("Entity Distribution by Argument Type")
+    plt.xticks(rotation=45)
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("Entity bias across argument types", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, or load its entities from the results store
+    if args.store:
+        df = load_for(args.store, analyze_entity_bias)
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+
+    # Generate visualizations
+    visualize_entity_distribution(df)
+    analyze_entity_bias(df)
+
+if __name__ == "__main__":
+    main()
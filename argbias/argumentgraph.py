@@ -0,0 +1,285 @@
+from .checkpoint import function_id, list_essays, run_essays, run_options
+from .common import get_sentiment, extract_named_entities, make_parser, parse_ann_graph
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Component labels, relation types and how brat Stance attributes map onto relations
+COMPONENT_LABELS = ["MajorClaim", "Claim", "Premise"]
+RELATION_TYPES = ["supports", "attacks"]
+STANCE_RELATIONS = {"For": "supports", "Against": "attacks"}
+
+class ArgumentGraph:
+    """
+    CSR graph over argument components of all essays.
+
+    Edges point from the supporting/attacking component to its target
+    (premise -> claim, claim -> major claim), so ``indptr``/``indices`` hold
+    each node's outgoing edges and ``edge_relation`` the relation code of
+    each edge. Node attributes are parallel arrays indexed by node id.
+    """
+
+    def __init__(self, essays, node_essay, node_ann_id, node_label, indptr, indices, edge_relation,
+                 node_sentiment=None, node_entities=None, entity_types=None,
+                 labels=None, relation_types=None):
+        self.essays = list(essays)
+        self.labels = list(labels if labels is not None else COMPONENT_LABELS)
+        self.relation_types = list(relation_types if relation_types is not None else RELATION_TYPES)
+        self.entity_types = list(entity_types or [])
+
+        self.node_essay = np.asarray(node_essay, dtype=np.int32)
+        self.node_ann_id = np.asarray(node_ann_id, dtype=object)
+        self.node_label = np.asarray(node_label, dtype=np.int8)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.edge_relation = np.asarray(edge_relation, dtype=np.int8)
+
+        n_nodes = len(self.node_label)
+        if node_sentiment is None:
+            node_sentiment = np.full(n_nodes, np.nan)
+        if node_entities is None:
+            node_entities = np.zeros((n_nodes, len(self.entity_types)), dtype=np.int32)
+        self.node_sentiment = np.asarray(node_sentiment, dtype=np.float64)
+        self.node_entities = np.asarray(node_entities, dtype=np.int32)
+        self._edge_sources = None
+
+    @classmethod
+    def from_edges(cls, essays, node_essay, node_ann_id, node_label, sources, targets, relations, **kwargs):
+        """
+        Build the CSR arrays from unordered (source, target, relation) edge lists.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        relations = np.asarray(relations, dtype=np.int8)
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(len(node_label) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(node_label)), out=indptr[1:])
+        return cls(essays, node_essay, node_ann_id, node_label, indptr,
+                   targets[order], relations[order], **kwargs)
+
+    @property
+    def n_nodes(self):
+        return len(self.node_label)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def edge_sources(self):
+        """
+        Source node of every edge, expanded from ``indptr``.
+        """
+        if self._edge_sources is None:
+            self._edge_sources = np.repeat(np.arange(self.n_nodes, dtype=np.int64), np.diff(self.indptr))
+        return self._edge_sources
+
+    def label_code(self, label):
+        return self.labels.index(label)
+
+    def relation_code(self, relation):
+        return self.relation_types.index(relation)
+
+    def _edge_mask(self, relation=None, source_labels=None, target_labels=None):
+        mask = np.ones(self.n_edges, dtype=bool)
+        if relation is not None:
+            mask &= self.edge_relation == self.relation_code(relation)
+        if source_labels is not None:
+            codes = [self.label_code(label) for label in source_labels]
+            mask &= np.isin(self.node_label[self.edge_sources()], codes)
+        if target_labels is not None:
+            codes = [self.label_code(label) for label in target_labels]
+            mask &= np.isin(self.node_label[self.indices], codes)
+        return mask
+
+    def in_degree(self, relation=None, source_labels=None):
+        """
+        Number of incoming edges per node.
+        """
+        mask = self._edge_mask(relation, source_labels)
+        return np.bincount(self.indices[mask], minlength=self.n_nodes)
+
+    def neighbor_mean(self, values, relation=None, source_labels=None):
+        """
+        Mean of ``values`` over each node's incoming neighbours.
+
+        Neighbours with a NaN value are ignored. Returns the means (NaN where a
+        node has no valid neighbour) and the number of neighbours averaged.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        sources = self.edge_sources()
+        mask = self._edge_mask(relation, source_labels) & ~np.isnan(values[sources])
+        targets = self.indices[mask]
+        counts = np.bincount(targets, minlength=self.n_nodes)
+        sums = np.bincount(targets, weights=values[sources[mask]], minlength=self.n_nodes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        return means, counts
+
+    def mean_premise_sentiment(self, relation=None, target_labels=("Claim", "MajorClaim")):
+        """
+        Mean sentiment of the premises pointing at each claim, next to the claim's own sentiment.
+        """
+        means, counts = self.neighbor_mean(self.node_sentiment, relation, source_labels=["Premise"])
+        codes = [self.label_code(label) for label in target_labels]
+        nodes = np.flatnonzero(np.isin(self.node_label, codes))
+        df = self.nodes_frame(nodes, with_entities=False)
+        df["PremiseSentiment"] = means[nodes]
+        df["Premises"] = counts[nodes]
+        df["SentimentGap"] = df["PremiseSentiment"] - df["Sentiment"]
+        return df
+
+    def entity_mix_by_relation(self, endpoint="source", normalize=True):
+        """
+        Entity-type counts on the source (or target) side of edges, per relation type.
+        """
+        if endpoint not in ("source", "target"):
+            raise ValueError("endpoint must be 'source' or 'target'")
+        nodes = self.edge_sources() if endpoint == "source" else self.indices
+        mix = np.zeros((len(self.relation_types), len(self.entity_types)), dtype=np.int64)
+        for code in range(len(self.relation_types)):
+            # Weight each node by how many edges of this relation touch it, then
+            # reduce with one matrix product instead of gathering per-edge rows
+            weights = np.bincount(nodes[self.edge_relation == code], minlength=self.n_nodes)
+            mix[code] = weights @ self.node_entities
+        df = pd.DataFrame(mix, index=self.relation_types, columns=self.entity_types)
+        if normalize:
+            df = df.div(df.sum(axis=1).replace(0, np.nan), axis=0).fillna(0.0)
+        return df
+
+    def depth_from_major_claim(self):
+        """
+        Shortest number of edges from each node to a MajorClaim (-1 if unreachable).
+        """
+        depth = np.full(self.n_nodes, -1, dtype=np.int32)
+        depth[self.node_label == self.label_code("MajorClaim")] = 0
+        sources = self.edge_sources()
+        level = 0
+        while True:
+            frontier = (depth[self.indices] == level) & (depth[sources] == -1)
+            if not frontier.any():
+                break
+            depth[sources[frontier]] = level + 1
+            level += 1
+        return depth
+
+    def nodes_frame(self, nodes=None, with_entities=True):
+        """
+        Node attributes as a DataFrame, optionally restricted to ``nodes``.
+        """
+        if nodes is None:
+            nodes = np.arange(self.n_nodes)
+        df = pd.DataFrame({
+            "Essay": np.asarray(self.essays, dtype=object)[self.node_essay[nodes]],
+            "Id": self.node_ann_id[nodes],
+            "Label": np.asarray(self.labels, dtype=object)[self.node_label[nodes]],
+            "Sentiment": self.node_sentiment[nodes]
+        }, index=pd.Index(nodes, name="Node"))
+        if with_entities and self.entity_types:
+            entities = pd.DataFrame(self.node_entities[nodes], index=df.index, columns=self.entity_types)
+            df = pd.concat([df, entities], axis=1)
+        return df
+
+    def edges_frame(self):
+        """
+        Edges as a DataFrame of source node, target node and relation type.
+        """
+        return pd.DataFrame({
+            "Source": self.edge_sources(),
+            "Target": self.indices,
+            "Relation": np.asarray(self.relation_types, dtype=object)[self.edge_relation]
+        })
+
+def build_argument_graph(dataset_path, sentiment_fn=None, entity_fn=None, entity_types=None, stance_edges=True,
+                         **run_kwargs):
+    """
+    Build an ArgumentGraph over every essay in the dataset.
+
+    ``sentiment_fn(text)`` and ``entity_fn(text)`` (returning (entity, type)
+    pairs) fill the node attributes when given. Claims are linked to the
+    essay's first MajorClaim through their Stance attribute unless
+    ``stance_edges`` is False. Essays are parsed and scored through
+    ``run_essays``, so ``run_kwargs`` (checkpoint_path, resume, ...) make a
+    long build resumable; the CSR arrays are assembled afterwards.
+    """
+    label_codes = {label: code for code, label in enumerate(COMPONENT_LABELS)}
+    relation_codes = {relation: code for code, relation in enumerate(RELATION_TYPES)}
+    type_codes = {ent_type: code for code, ent_type in enumerate(entity_types or [])}
+    fixed_types = entity_types is not None
+
+    def process_essay(file, text_filepath, ann_filepath):
+        components, essay_relations, stances = parse_ann_graph(ann_filepath)
+        components = sorted((c for c in components if c["label"] in label_codes), key=lambda c: c["start"])
+        for comp in components:
+            comp["sentiment"] = sentiment_fn(comp["text"]) if sentiment_fn else None
+            comp["entity_types"] = [ent_type for _, ent_type in entity_fn(comp["text"])] if entity_fn else []
+        return {"components": components, "relations": essay_relations, "stances": stances}, len(components)
+
+    config = {"sentiment": function_id(sentiment_fn), "entities": function_id(entity_fn)}
+    essays = list_essays(dataset_path)
+    results = run_essays(dataset_path, process_essay, "argbias.argumentgraph", essays=essays, config=config,
+                         **run_kwargs)
+
+    node_essay, node_ann_id, node_label, node_sentiment = [], [], [], []
+    sources, targets, relations = [], [], []
+    entity_nodes, entity_type_codes = [], []
+
+    for essay_code, essay in enumerate(results):
+        node_of = {}
+        major_claims = []
+        for comp in essay["components"]:
+            node = len(node_label)
+            node_of[comp["id"]] = node
+            node_essay.append(essay_code)
+            node_ann_id.append(comp["id"])
+            node_label.append(label_codes[comp["label"]])
+            node_sentiment.append(np.nan if comp["sentiment"] is None else comp["sentiment"])
+            if comp["label"] == "MajorClaim":
+                major_claims.append(node)
+            for ent_type in comp["entity_types"]:
+                if ent_type not in type_codes:
+                    if fixed_types:
+                        continue
+                    type_codes[ent_type] = len(type_codes)
+                entity_nodes.append(node)
+                entity_type_codes.append(type_codes[ent_type])
+
+        for rel in essay["relations"]:
+            if rel["type"] in relation_codes and rel["source"] in node_of and rel["target"] in node_of:
+                sources.append(node_of[rel["source"]])
+                targets.append(node_of[rel["target"]])
+                relations.append(relation_codes[rel["type"]])
+
+        if stance_edges and major_claims:
+            for ann_id, stance in essay["stances"].items():
+                if ann_id in node_of and stance in STANCE_RELATIONS:
+                    sources.append(node_of[ann_id])
+                    targets.append(major_claims[0])
+                    relations.append(relation_codes[STANCE_RELATIONS[stance]])
+
+    essays = [file for file, _, _ in essays]
+    n_nodes = len(node_label)
+    n_types = len(type_codes)
+    flat = np.asarray(entity_nodes, dtype=np.int64) * n_types + np.asarray(entity_type_codes, dtype=np.int64)
+    node_entities = np.bincount(flat, minlength=n_nodes * n_types).reshape(n_nodes, n_types)
+
+    return ArgumentGraph.from_edges(
+        essays, node_essay, node_ann_id, node_label, sources, targets, relations,
+        node_sentiment=node_sentiment, node_entities=node_entities,
+        entity_types=sorted(type_codes, key=type_codes.get)
+    )
+
+def main(argv=None):
+    args = make_parser("Structural bias metrics over the argument graph", checkpoint=True).parse_args(argv)
+
+    graph = build_argument_graph(args.dataset_path, get_sentiment, extract_named_entities, **run_options(args))
+    print(f"{graph.n_nodes} components, {graph.n_edges} relations")
+
+    claims = graph.mean_premise_sentiment()
+    print(claims.groupby("Label")[["Sentiment", "PremiseSentiment", "SentimentGap"]].mean())
+    print(graph.entity_mix_by_relation())
+    depth = graph.depth_from_major_claim()
+    print(pd.Series(depth).value_counts().sort_index())
+
+if __name__ == "__main__":
+    main()
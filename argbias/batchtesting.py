@@ -0,0 +1,205 @@
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+stats = lazy_import("scipy.stats")
+
+def _slice_codes(df, by):
+    """
+    Group code of every row for the slice columns ``by`` and the slice keys in code order.
+    """
+    by = list(by)
+    if not by:
+        return np.zeros(len(df), dtype=np.int64), pd.DataFrame(index=[0])
+    grouped = df.groupby(by, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().index.to_frame(index=False)
+    return codes, keys
+
+def contingency_stack(df, by=(), rows="Type", cols="Label"):
+    """
+    Build one rows x cols contingency table per slice of ``by`` in a single pass.
+
+    Returns an array of shape (slices, rows, cols), the slice keys and the
+    row/column levels shared by every table.
+    """
+    slice_codes, keys = _slice_codes(df, by)
+    row_codes, row_levels = pd.factorize(df[rows], sort=True)
+    col_codes, col_levels = pd.factorize(df[cols], sort=True)
+    valid = (slice_codes >= 0) & (row_codes >= 0) & (col_codes >= 0)
+
+    shape = (len(keys), len(row_levels), len(col_levels))
+    flat = np.ravel_multi_index((slice_codes[valid], row_codes[valid], col_codes[valid]), shape)
+    tables = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+    return tables, keys, list(row_levels), list(col_levels)
+
+def group_stack(df, by=(), groups="Label", values="Sentiment"):
+    """
+    Per-slice, per-group count, sum and sum of squares of ``values`` in a single pass.
+
+    Values are centred on their overall mean first so the sums of squares stay
+    well conditioned; this does not change the F statistic.
+    """
+    df = df[df[values].notna()]
+    slice_codes, keys = _slice_codes(df, by)
+    group_codes, group_levels = pd.factorize(df[groups], sort=True)
+    valid = (slice_codes >= 0) & (group_codes >= 0)
+
+    x = df[values].to_numpy(dtype=np.float64)[valid]
+    x = x - x.mean() if len(x) else x
+    shape = (len(keys), len(group_levels))
+    flat = np.ravel_multi_index((slice_codes[valid], group_codes[valid]), shape)
+    size = int(np.prod(shape))
+    counts = np.bincount(flat, minlength=size).reshape(shape)
+    sums = np.bincount(flat, weights=x, minlength=size).reshape(shape)
+    sumsq = np.bincount(flat, weights=x * x, minlength=size).reshape(shape)
+    return counts, sums, sumsq, keys, list(group_levels)
+
+def batch_chi_square(tables, correction=True):
+    """
+    Chi-square test of independence for a stack of contingency tables.
+
+    Matches scipy's chi2_contingency per table, including the Yates correction
+    for 2x2 tables, after dropping empty rows and columns of each table.
+    Returns statistics, degrees of freedom, p-values and table totals.
+    """
+    observed = np.asarray(tables, dtype=np.float64)
+    row_sums = observed.sum(axis=2)
+    col_sums = observed.sum(axis=1)
+    totals = row_sums.sum(axis=1)
+
+    dof = ((row_sums > 0).sum(axis=1) - 1) * ((col_sums > 0).sum(axis=1) - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        expected = row_sums[:, :, None] * col_sums[:, None, :] / totals[:, None, None]
+    expected = np.nan_to_num(expected)
+
+    if correction:
+        diff = expected - observed
+        yates = np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        observed = np.where((dof == 1)[:, None, None], observed + yates, observed)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        terms = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+    chi2_stats = terms.sum(axis=(1, 2))
+
+    valid = dof > 0
+    chi2_stats = np.where(valid, chi2_stats, np.nan)
+    p_values = np.where(valid, stats.chi2.sf(chi2_stats, np.maximum(dof, 1)), np.nan)
+    return chi2_stats, dof, p_values, totals
+
+def batch_anova(counts, sums, sumsq):
+    """
+    One-way ANOVA for a stack of grouped samples given per-group moments.
+
+    Matches scipy's f_oneway per slice, ignoring empty groups. Returns F
+    statistics, between/within degrees of freedom, p-values and sample sizes.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    sums = np.asarray(sums, dtype=np.float64)
+    sumsq = np.asarray(sumsq, dtype=np.float64)
+
+    n_total = counts.sum(axis=1)
+    n_groups = (counts > 0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        group_term = np.where(counts > 0, sums ** 2 / counts, 0.0).sum(axis=1)
+        ss_between = group_term - sums.sum(axis=1) ** 2 / n_total
+        ss_within = sumsq.sum(axis=1) - group_term
+
+        df_between = n_groups - 1
+        df_within = n_total - n_groups
+        valid = (df_between > 0) & (df_within > 0)
+        f_stats = np.where(valid, (ss_between / df_between) / (ss_within / df_within), np.nan)
+    p_values = np.where(valid, stats.f.sf(f_stats, np.maximum(df_between, 1), np.maximum(df_within, 1)), np.nan)
+    return f_stats, df_between, df_within, p_values, n_total
+
+def adjust_pvalues(p_values, method="fdr_bh"):
+    """
+    Correct p-values for multiple comparisons (Benjamini-Hochberg "fdr_bh" or "holm").
+
+    NaN p-values are left as NaN and do not count towards the number of tests.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    m = len(valid)
+    if m == 0:
+        return adjusted
+
+    order = valid[np.argsort(p_values[valid], kind="stable")]
+    ranked = p_values[order]
+    if method == "fdr_bh":
+        scaled = ranked * m / np.arange(1, m + 1)
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+    elif method == "holm":
+        scaled = ranked * (m - np.arange(m))
+        scaled = np.maximum.accumulate(scaled)
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+    adjusted[order] = np.minimum(scaled, 1.0)
+    return adjusted
+
+def chi_square_tests(df, by=(), rows="Type", cols="Label", correction=True):
+    """
+    Chi-square test of rows vs. cols within every slice of ``by``.
+    """
+    tables, keys, _, _ = contingency_stack(df, by, rows, cols)
+    return chi_square_results(tables, keys, rows, cols, correction)
+
+def chi_square_results(tables, keys, rows="Type", cols="Label", correction=True):
+    """
+    Tidy chi-square results for a stack of contingency tables and their slice keys.
+    """
+    chi2_stats, dof, p_values, totals = batch_chi_square(tables, correction)
+    results = keys.reset_index(drop=True)
+    results["Test"] = f"chi2({rows}x{cols})"
+    results["Statistic"] = chi2_stats
+    results["DoF"] = dof
+    results["DoF2"] = np.nan
+    results["N"] = totals.astype(np.int64)
+    results["PValue"] = p_values
+    return results
+
+def anova_tests(df, by=(), groups="Label", values="Sentiment"):
+    """
+    One-way ANOVA of ``values`` across ``groups`` within every slice of ``by``.
+    """
+    counts, sums, sumsq, keys, _ = group_stack(df, by, groups, values)
+    f_stats, df_between, df_within, p_values, n_total = batch_anova(counts, sums, sumsq)
+    results = keys.reset_index(drop=True)
+    results["Test"] = f"anova({values}~{groups})"
+    results["Statistic"] = f_stats
+    results["DoF"] = df_between
+    results["DoF2"] = df_within
+    results["N"] = n_total.astype(np.int64)
+    results["PValue"] = p_values
+    return results
+
+def run_batch_tests(df, slicings, test="chi2", method="fdr_bh", alpha=0.05, **kwargs):
+    """
+    Run one test across several slicings and correct all p-values together.
+
+    ``slicings`` is a list of column lists, e.g. ``[[], ["Topic"], ["Topic", "Label"]]``
+    where ``[]`` is the global test. Extra keyword arguments are passed to
+    chi_square_tests (``test="chi2"``) or anova_tests (``test="anova"``).
+    Returns a single tidy table with one row per slice.
+    """
+    if test == "chi2":
+        run = chi_square_tests
+    elif test == "anova":
+        run = anova_tests
+    else:
+        raise ValueError(f"Unknown test: {test}")
+
+    frames = []
+    for by in slicings:
+        results = run(df, by, **kwargs)
+        results.insert(0, "Slicing", " x ".join(by) if by else "All")
+        frames.append(results)
+    results = pd.concat(frames, ignore_index=True, sort=False)
+
+    slice_columns = [col for col in results.columns
+                     if col not in ("Slicing", "Test", "Statistic", "DoF", "DoF2", "N", "PValue")]
+    results = results[["Slicing"] + slice_columns + ["Test", "Statistic", "DoF", "DoF2", "N", "PValue"]].copy()
+    results["PAdjusted"] = adjust_pvalues(results["PValue"], method)
+    results["Significant"] = results["PAdjusted"] < alpha
+    return results
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, extract_named_entities as extract_entities, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Entity types analyze_entity_influence looks at by default
+INFLUENCE_ENTITY_TYPES = ["ORG", "PERSON", "GPE", "DATE"]
+
+def process_essay(file, text_filepath, ann_filepath):
+    """
+    Extract entities and labels from one essay.
+    """
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_entities(ann["text"])
+        for entity, ent_type in entities:
+            rows.append({
+                "Essay": file,
+                "Label": ann["label"],
+                "Entity": entity,
+                "Type": ent_type
+            })
+    return rows, len(annotations)
+
+def process_dataset(dataset_path, **run_kwargs):
+    """
+    Process the dataset to extract entities and labels.
+    """
+    results = run_essays(dataset_path, process_essay, "argbias.biasquantification", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+def calculate_pmi(df):
+    """
+    Calculate PMI scores for entity-label associations.
+    """
+    entity_label_counts = defaultdict(int)
+    entity_counts = defaultdict(int)
+    label_counts = defaultdict(int)
+    total = len(df)
+
+    for _, row in df.iterrows():
+        entity_label_counts[(row["Type"], row["Label"])] += 1
+        entity_counts[row["Type"]] += 1
+        label_counts[row["Label"]] += 1
+
+    pmi_scores = {}
+    for (entity, label), count in entity_label_counts.items():
+        p_entity_label = count / total
+        p_entity = entity_counts[entity] / total
+        p_label = label_counts[label] / total
+        pmi = np.log2(p_entity_label / (p_entity * p_label))
+        pmi_scores[(entity, label)] = pmi
+
+    return pmi_scores
+
+def analyze_entity_influence(df, entity_types=None):
+    """
+    Analyze the influence of specific entity types on argument labels.
+    """
+    if entity_types is None:
+        entity_types = INFLUENCE_ENTITY_TYPES
+
+    filtered_df = df[df["Type"].isin(entity_types)]
+    entity_label_freq = filtered_df.groupby(["Type", "Label"]).size().unstack(fill_value=0)
+    entity_label_freq_norm = entity_label_freq.div(entity_label_freq.sum(axis=0), axis=1)
+
+    return entity_label_freq, entity_label_freq_norm
+
+def visualize_pmi_scores(pmi_scores):
+    """
+    Visualize PMI scores using a bar plot.
+    """
+    entities, labels, pmi_values = zip(*[(k[0], k[1], v) for k, v in pmi_scores.items()])
+    pmi_df = pd.DataFrame({"Entity": entities, "Label": labels, "PMI": pmi_values})
+
+    plt.figure(figsize=(12, 6))
+    sns.barplot(data=pmi_df, x="Entity", y="PMI", hue="Label", palette="viridis")
+    plt.title("PMI Scores for Entity-Label Associations")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.show()
+
+def visualize_entity_influence(entity_label_freq_norm):
+    """
+    Visualize normalized entity-label frequencies using a heatmap.
+    """
+    plt.figure(figsize=(10, 6))
+    sns.heatmap(entity_label_freq_norm, annot=True, cmap="viridis", fmt=".2f")
+    plt.title("Normalized Entity-Label Frequency")
+    plt.xlabel("Argument Label")
+    plt.ylabel("Entity Type")
+    plt.tight_layout()
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("PMI and entity influence on argument labels", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, or load its entities from the results store
+    if args.store:
+        df = load_for(args.store, calculate_pmi)
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+
+    # Calculate PMI scores
+    pmi_scores = calculate_pmi(df)
+
+    # Analyze entity influence
+    entity_label_freq, entity_label_freq_norm = analyze_entity_influence(df)
+
+    # Visualize results
+    visualize_pmi_scores(pmi_scores)
+    visualize_entity_influence(entity_label_freq_norm)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import time
+
+def list_essays(dataset_path):
+    """
+    Essays with an .ann file, as (file, text_filepath, ann_filepath) in a stable order.
+    """
+    essays = []
+    for file in sorted(os.listdir(dataset_path)):
+        if file.endswith(".txt"):
+            text_filepath = os.path.join(dataset_path, file)
+            ann_filepath = text_filepath.replace(".txt", ".ann")
+            if os.path.exists(ann_filepath):
+                essays.append((file, text_filepath, ann_filepath))
+    return essays
+
+class Checkpoint:
+    """
+    Append-only JSON-lines log of completed essays' results.
+
+    The first line records the run name, dataset path and configuration
+    (e.g. the entity extractor), so a checkpoint is never resumed by a
+    different analysis or with different settings. Each later line holds one
+    essay's result and is made durable (flush + fsync) every ``every`` essays. A line cut short by a crash
+    is dropped on resume, so that essay is simply processed again. A checkpoint
+    that already holds results is never emptied unless ``overwrite`` is set.
+    """
+
+    def __init__(self, path, name, resume=False, every=10, dataset_path=None, config=None, overwrite=False):
+        self.path = path
+        self.name = name
+        self.header = {"run": name, "dataset": os.path.abspath(dataset_path) if dataset_path else None,
+                       "config": config or {}}
+        self.every = max(1, every)
+        self.completed = {}
+        self._pending = 0
+
+        valid_bytes = 0
+        if resume and os.path.exists(path):
+            valid_bytes = self._load()
+        elif not overwrite and self._has_records():
+            raise FileExistsError(f"Checkpoint {path} already holds results; pass --resume to continue the run "
+                                  f"or --overwrite to start it over")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "r+b" if valid_bytes else "wb")
+        self._file.truncate(valid_bytes)
+        self._file.seek(valid_bytes)
+        if not valid_bytes:
+            self._write(self.header)
+            self._sync()
+
+    def _has_records(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            f.readline()
+            return bool(f.read(1))
+
+    def _load(self):
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if valid_bytes == 0:
+                    self._check_header(record)
+                else:
+                    self.completed[record["essay"]] = (record["result"], record["annotations"])
+                valid_bytes += len(line)
+        return valid_bytes
+
+    def _check_header(self, record):
+        for field, description in (("run", "run"), ("dataset", "dataset"), ("config", "configuration")):
+            if record.get(field) != self.header[field]:
+                raise ValueError(f"Checkpoint {self.path} was written with {description} {record.get(field)!r}, "
+                                 f"not {self.header[field]!r}")
+
+    def _write(self, record):
+        self._file.write(json.dumps(record).encode("utf-8") + b"\n")
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def record(self, essay, result, n_annotations):
+        """
+        Log one completed essay; durable after at most ``every`` essays.
+        """
+        self._write({"essay": essay, "result": result, "annotations": n_annotations})
+        self.completed[essay] = (result, n_annotations)
+        self._pending += 1
+        if self._pending >= self.every:
+            self._sync()
+
+    def close(self):
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+
+class ProgressReporter:
+    """
+    Periodic essays/sec, annotations/sec and ETA report for a long run.
+
+    Rates only count work done in this session, so resumed essays do not
+    inflate the throughput or shorten the ETA.
+    """
+
+    def __init__(self, total, done=0, interval=5.0, stream=None):
+        self.total = total
+        self.done = done
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self.essays = 0
+        self.annotations = 0
+        self.start = time.monotonic()
+        self._last_report = self.start
+
+    def update(self, n_annotations):
+        self.done += 1
+        self.essays += 1
+        self.annotations += n_annotations
+        now = time.monotonic()
+        if now - self._last_report >= self.interval or self.done == self.total:
+            self._last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        elapsed = max((now or time.monotonic()) - self.start, 1e-9)
+        essay_rate = self.essays / elapsed
+        annotation_rate = self.annotations / elapsed
+        remaining = self.total - self.done
+        eta = format_duration(remaining / essay_rate) if essay_rate > 0 else "--:--:--"
+        print(f"[{self.done}/{self.total}] {essay_rate:.2f} essays/s, {annotation_rate:.1f} annotations/s, ETA {eta}",
+              file=self.stream, flush=True)
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def run_essays(dataset_path, process_essay, name, checkpoint_path=None, resume=False,
+               checkpoint_every=10, progress=True, essays=None, config=None, overwrite=False):
+    """
+    Run ``process_essay(file, text_filepath, ann_filepath)`` over every essay.
+
+    ``process_essay`` returns a JSON-serialisable result and the number of
+    annotations it handled. With ``checkpoint_path`` each result is logged as
+    it completes; with ``resume`` essays already in the checkpoint are skipped.
+    ``name`` must be a constant identifying the analysis (not ``__name__``,
+    which is "__main__" under ``python -m``), and ``config`` holds any
+    settings that change the results; both are checked on resume. An existing
+    checkpoint with results is only started over with ``overwrite``.
+    Returns the results in essay order.
+    """
+    if essays is None:
+        essays = list_essays(dataset_path)
+    checkpoint = (Checkpoint(checkpoint_path, name, resume, checkpoint_every, dataset_path, config, overwrite)
+                  if checkpoint_path else None)
+    completed = checkpoint.completed if checkpoint else {}
+    done = sum(1 for file, _, _ in essays if file in completed)
+    if checkpoint and resume and done:
+        print(f"Resuming {name}: {done} of {len(essays)} essays already complete", file=sys.stderr)
+    reporter = ProgressReporter(len(essays), done) if progress else None
+
+    results = []
+    try:
+        for file, text_filepath, ann_filepath in essays:
+            if file in completed:
+                results.append(completed[file][0])
+                continue
+            result, n_annotations = process_essay(file, text_filepath, ann_filepath)
+            if checkpoint:
+                checkpoint.record(file, result, n_annotations)
+            if reporter:
+                reporter.update(n_annotations)
+            results.append(result)
+    finally:
+        if checkpoint:
+            checkpoint.close()
+    return results
+
+def function_id(fn):
+    """
+    Stable description of a processing function for a checkpoint's configuration.
+    """
+    if fn is None:
+        return None
+    if hasattr(fn, "mode"):
+        return fn.mode
+    return f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', type(fn).__name__)}"
+
+def add_checkpoint_arguments(parser):
+    """
+    Add --checkpoint/--resume/--overwrite/--checkpoint-every/--no-progress to an entry point's parser.
+    """
+    parser.add_argument("--checkpoint", help="File to log completed essays to, so an interrupted run can resume")
+    parser.add_argument("--resume", action="store_true", help="Skip essays already recorded in --checkpoint")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Start over even if --checkpoint already holds results")
+    parser.add_argument("--checkpoint-every", type=int, default=10,
+                        help="Make the checkpoint durable every N essays (default: 10)")
+    parser.add_argument("--no-progress", dest="progress", action="store_false",
+                        help="Do not report essays/sec, annotations/sec and ETA")
+    return parser
+
+def run_options(args):
+    """
+    Keyword arguments for run_essays taken from parsed command-line arguments.
+    """
+    for option in ("resume", "overwrite"):
+        if getattr(args, option) and not args.checkpoint:
+            raise SystemExit(f"--{option} requires --checkpoint")
+    if args.resume and args.overwrite:
+        raise SystemExit("--resume and --overwrite cannot be combined")
+    return {"checkpoint_path": args.checkpoint, "resume": args.resume, "overwrite": args.overwrite,
+            "checkpoint_every": args.checkpoint_every, "progress": args.progress}
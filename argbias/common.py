@@ -0,0 +1,145 @@
+import argparse
+from functools import lru_cache
+
+from .checkpoint import add_checkpoint_arguments
+from .lazy import lazy_import
+
+spacy = lazy_import("spacy")
+textblob = lazy_import("textblob")
+
+SPACY_MODEL = "en_core_web_sm"
+
+@lru_cache(maxsize=None)
+def get_nlp(model=SPACY_MODEL):
+    """
+    Load a spaCy model once, on first use.
+    """
+    return spacy.load(model)
+
+def parse_ann_file(ann_filepath):
+    """
+    Parse .ann files to extract annotations.
+    """
+    annotations = []
+    with open(ann_filepath, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.strip().split("\t")
+            if len(parts) < 3:
+                continue
+            annotation_id = parts[0]
+            annotation_type_info = parts[1].split()
+            annotation_text = parts[2]
+            label = annotation_type_info[0]
+            start_idx = int(annotation_type_info[1])
+            end_idx = int(annotation_type_info[2])
+            annotations.append({
+                "id": annotation_id,
+                "label": label,
+                "start": start_idx,
+                "end": end_idx,
+                "text": annotation_text
+            })
+    return annotations
+
+def parse_ann_graph(ann_filepath):
+    """
+    Parse components, relations and stance attributes from a .ann file.
+    """
+    components = []
+    relations = []
+    stances = {}
+    with open(ann_filepath, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.strip().split("\t")
+            if len(parts) < 2:
+                continue
+            annotation_id = parts[0]
+            annotation_type_info = parts[1].split()
+            if annotation_id.startswith("T") and len(parts) >= 3:
+                components.append({
+                    "id": annotation_id,
+                    "label": annotation_type_info[0],
+                    "start": int(annotation_type_info[1]),
+                    "end": int(annotation_type_info[-1]),
+                    "text": parts[2]
+                })
+            elif annotation_id.startswith("R") and len(annotation_type_info) >= 3:
+                relations.append({
+                    "id": annotation_id,
+                    "type": annotation_type_info[0],
+                    "source": annotation_type_info[1].split(":", 1)[1],
+                    "target": annotation_type_info[2].split(":", 1)[1]
+                })
+            elif annotation_id.startswith("A") and len(annotation_type_info) >= 3:
+                if annotation_type_info[0] == "Stance":
+                    stances[annotation_type_info[1]] = annotation_type_info[2]
+    return components, relations, stances
+
+def extract_named_entities(text):
+    """
+    Extract named entities using spaCy's NER.
+    """
+    doc = get_nlp()(text)
+    return [(ent.text, ent.label_) for ent in doc.ents]
+
+def get_sentiment(text):
+    """
+    Calculate sentiment polarity using TextBlob.
+    """
+    return textblob.TextBlob(text).sentiment.polarity
+
+def categorize_topic(text):
+    """
+    Assign an essay to a topic using keyword matching.
+    """
+    social_keywords = {"society", "culture", "education", "justice", "discrimination", "rights", "equality"}
+    economic_keywords = {"economy", "finance", "market", "business", "money", "tax", "trade", "employment"}
+    technology_keywords = {"AI", "technology", "innovation", "science", "engineering", "internet"}
+    politics_keywords = {"government", "policy", "election", "law", "politics", "democracy"}
+
+    text_lower = text.lower()
+    if any(word in text_lower for word in social_keywords):
+        return "Social Issues"
+    elif any(word in text_lower for word in economic_keywords):
+        return "Economic Issues"
+    elif any(word in text_lower for word in technology_keywords):
+        return "Technology"
+    elif any(word in text_lower for word in politics_keywords):
+        return "Politics"
+    else:
+        return "Other"
+
+DATASET_PATH_HELP = "Path to the brat-project directory of the Argument Annotated Essays dataset"
+
+class AnalysisParser(argparse.ArgumentParser):
+    """
+    Argument parser that requires the dataset path unless the tables come from --store.
+    """
+
+    def parse_args(self, args=None, namespace=None):
+        args = super().parse_args(args, namespace)
+        if args.dataset_path is None and not args.store:
+            self.error("the following arguments are required: dataset_path (or --store)")
+        return args
+
+def make_parser(description, checkpoint=False, store=False):
+    """
+    Argument parser shared by the analysis entry points.
+
+    ``dataset_path`` is a required positional argument. ``checkpoint`` adds
+    the --checkpoint/--resume options for long runs; ``store`` adds --store to
+    read the tables from a results store instead, and then makes
+    ``dataset_path`` optional.
+    """
+    if store:
+        parser = AnalysisParser(description=description)
+        parser.add_argument("dataset_path", nargs="?", help=DATASET_PATH_HELP)
+    else:
+        parser = argparse.ArgumentParser(description=description)
+        parser.add_argument("dataset_path", help=DATASET_PATH_HELP)
+    if checkpoint:
+        add_checkpoint_arguments(parser)
+    if store:
+        parser.add_argument("--store", help="Read the annotation and entity tables from a results store "
+                                            "(built by argbias.resultsstore) instead of processing the essays")
+    return parser
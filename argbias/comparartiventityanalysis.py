@@ -0,0 +1,50 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, extract_named_entities, categorize_topic, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Function to extract entities and the topic of one essay
+def process_essay(file, text_filepath, ann_filepath):
+    with open(text_filepath, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    rows = []
+    topic = categorize_topic(text)
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_named_entities(ann["text"])
+        for entity, ent_type in entities:
+            rows.append({"Essay": file, "Topic": topic, "Label": ann["label"], "Entity": entity, "Type": ent_type})
+    return rows, len(annotations)
+
+# Function to process dataset
+def process_dataset(dataset_path, **run_kwargs):
+    results = run_essays(dataset_path, process_essay, "argbias.comparartiventityanalysis", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+# Function to visualize entity distribution across topics
+def visualize_entity_distribution_by_topic(df):
+    plt.figure(figsize=(12, 6))
+    sns.countplot(data=df, x="Type", hue="Topic", order=df["Type"].value_counts().index)
+    plt.title("Entity Distribution by Topic")
+    plt.xticks(rotation=45)
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("Entity distribution across essay topics", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, or load its entities from the results store
+    if args.store:
+        df = load_for(args.store, visualize_entity_distribution_by_topic)
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+
+    # Generate visualization
+    visualize_entity_distribution_by_topic(df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from functools import partial
+from .checkpoint import function_id, run_essays, run_options
+from .common import parse_ann_file, extract_named_entities, get_nlp, make_parser
+from .gazetteer import FastEntityExtractor, agreement_report, dataset_vocabulary, sample_texts
+from .lazy import lazy_import
+from .resultsstore import load_for
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Demographic-related entity types (GENDER terms are only found by the gazetteer)
+DEMOGRAPHIC_TYPES = ["PERSON", "NORP", "GPE", "ORG", "FAC", "GENDER"]
+
+# Function to detect demographic entities in one essay
+def process_essay(file, text_filepath, ann_filepath, extract_fn=extract_named_entities):
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_fn(ann["text"])
+        for entity, ent_type in entities:
+            if ent_type in DEMOGRAPHIC_TYPES:
+                rows.append({"Essay": file, "Label": ann["label"], "Entity": entity, "Type": ent_type})
+    return rows, len(annotations)
+
+# Function to process dataset and detect bias in entity usage
+def process_bias_detection(dataset_path, extract_fn=extract_named_entities, **run_kwargs):
+    results = run_essays(dataset_path, partial(process_essay, extract_fn=extract_fn),
+                         "argbias.demographicentitydistributioninargument",
+                         config={"extractor": function_id(extract_fn)}, **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+# Function to visualize entity bias across argument types
+def visualize_bias_distribution(df):
+    if df.empty:
+        print("No demographic entities found in the dataset.")
+        return
+    
+    plt.figure(figsize=(12, 6))
+    sns.countplot(data=df, x="Type", hue="Label", order=df["Type"].value_counts().index)
+    plt.title("Demographic Entity Distribution Across Argument Components")
+    plt.xticks(rotation=45)
+    plt.show()
+
+def main(argv=None):
+    parser = make_parser("Demographic entity distribution across argument components", checkpoint=True, store=True)
+    parser.add_argument("--gazetteer", action="store_true",
+                        help="Match entities with the gazetteer and run spaCy only on spans it can't resolve; "
+                             "also counts GENDER terms")
+    parser.add_argument("--agreement-sample", type=int, default=0, metavar="N",
+                        help="Compare the gazetteer path against full spaCy NER on N sampled components")
+    args = parser.parse_args(argv)
+    if args.store and args.gazetteer:
+        parser.error("--gazetteer has no effect with --store; the store holds the entities it was built with")
+    if args.agreement_sample and args.dataset_path is None:
+        parser.error("--agreement-sample needs dataset_path")
+    vocabulary = dataset_vocabulary(args.dataset_path) if args.gazetteer or args.agreement_sample else None
+
+    if args.agreement_sample:
+        extractor = FastEntityExtractor(nlp=get_nlp(), types=DEMOGRAPHIC_TYPES, vocabulary=vocabulary)
+        texts = sample_texts(args.dataset_path, args.agreement_sample)
+        print(agreement_report(texts, extractor, get_nlp(), DEMOGRAPHIC_TYPES).to_string(index=False))
+
+    # Process dataset, or load its entities from the results store
+    if args.store:
+        df = load_for(args.store, visualize_bias_distribution, filters={"Type": DEMOGRAPHIC_TYPES})
+    elif args.gazetteer:
+        extractor = FastEntityExtractor(nlp=get_nlp(), types=DEMOGRAPHIC_TYPES, vocabulary=vocabulary)
+        df = process_bias_detection(args.dataset_path, extractor, **run_options(args))
+        print(f"Gazetteer resolved {extractor.stats['gazetteer_only']} of {extractor.stats['spans']} spans without NER")
+    else:
+        df = process_bias_detection(args.dataset_path, **run_options(args))
+
+    # Generate visualization
+    visualize_bias_distribution(df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from functools import partial
+from .checkpoint import function_id, run_essays, run_options
+from .common import parse_ann_file, extract_named_entities as extract_entities, get_nlp, make_parser
+from .gazetteer import FastEntityExtractor, agreement_report, dataset_vocabulary, sample_texts
+from .lazy import lazy_import
+from .resultsstore import load_for
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Entity types analyze_bias looks at
+BIAS_ENTITY_TYPES = ["PERSON", "NORP"]
+
+def process_essay(file, text_filepath, ann_filepath, extract_fn=extract_entities):
+    """
+    Extract entities and labels from one essay.
+    """
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_fn(ann["text"])
+        for entity, ent_type in entities:
+            rows.append({
+                "Essay": file,
+                "Label": ann["label"],
+                "Entity": entity,
+                "Type": ent_type
+            })
+    return rows, len(annotations)
+
+def process_dataset(dataset_path, extract_fn=extract_entities, **run_kwargs):
+    """
+    Process the dataset to extract entities and labels.
+    """
+    results = run_essays(dataset_path, partial(process_essay, extract_fn=extract_fn), "argbias.ethicalnalysis",
+                         config={"extractor": function_id(extract_fn)}, **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+def analyze_bias(df):
+    """
+    Analyze bias in entity usage (e.g., gender, race).
+    """
+    # Focus on PERSON and NORP entities
+    filtered_df = df[df["Type"].isin(BIAS_ENTITY_TYPES)]
+
+    # Count occurrences of each entity type per label
+    entity_label_counts = filtered_df.groupby(["Type", "Label"]).size().unstack(fill_value=0)
+
+    # Normalize counts by label
+    entity_label_freq_norm = entity_label_counts.div(entity_label_counts.sum(axis=0), axis=1)
+
+    return entity_label_counts, entity_label_freq_norm
+
+def visualize_bias(entity_label_counts, entity_label_freq_norm):
+    """
+    Visualize bias in entity usage.
+    """
+    # Plot raw counts using a bar plot
+    plt.figure(figsize=(12, 6))
+    entity_label_counts.plot(kind="bar", stacked=True, colormap="viridis", edgecolor="black")
+    plt.title("Entity-Label Counts (PERSON and NORP)", fontsize=16)
+    plt.xlabel("Entity Type", fontsize=14)
+    plt.ylabel("Count", fontsize=14)
+    plt.xticks(rotation=0, fontsize=12)
+    plt.yticks(fontsize=12)
+    plt.legend(title="Argument Label", bbox_to_anchor=(1.05, 1), loc="upper left")
+    plt.tight_layout()
+    plt.show()
+
+    # Plot normalized frequencies using a heatmap
+    plt.figure(figsize=(12, 6))
+    sns.heatmap(entity_label_freq_norm, annot=True, cmap="viridis", fmt=".2f")
+    plt.title("Normalized Entity-Label Frequencies (PERSON and NORP)", fontsize=16)
+    plt.xlabel("Argument Label", fontsize=14)
+    plt.ylabel("Entity Type", fontsize=14)
+    plt.tight_layout()
+    plt.show()
+
+def main(argv=None):
+    parser = make_parser("Bias in PERSON and NORP entity usage across argument labels", checkpoint=True, store=True)
+    parser.add_argument("--gazetteer", action="store_true",
+                        help="Match entities with the gazetteer and run spaCy only on spans it can't resolve")
+    parser.add_argument("--agreement-sample", type=int, default=0, metavar="N",
+                        help="Compare the gazetteer path against full spaCy NER on N sampled components")
+    args = parser.parse_args(argv)
+    if args.store and args.gazetteer:
+        parser.error("--gazetteer has no effect with --store; the store holds the entities it was built with")
+    if args.agreement_sample and args.dataset_path is None:
+        parser.error("--agreement-sample needs dataset_path")
+    vocabulary = dataset_vocabulary(args.dataset_path) if args.gazetteer or args.agreement_sample else None
+
+    if args.agreement_sample:
+        extractor = FastEntityExtractor(nlp=get_nlp(), types=BIAS_ENTITY_TYPES, vocabulary=vocabulary)
+        texts = sample_texts(args.dataset_path, args.agreement_sample)
+        print(agreement_report(texts, extractor, get_nlp(), BIAS_ENTITY_TYPES).to_string(index=False))
+
+    # Process dataset, or load its entities from the results store
+    if args.store:
+        df = load_for(args.store, analyze_bias, filters={"Type": BIAS_ENTITY_TYPES})
+    elif args.gazetteer:
+        extractor = FastEntityExtractor(nlp=get_nlp(), types=BIAS_ENTITY_TYPES, vocabulary=vocabulary)
+        df = process_dataset(args.dataset_path, extractor, **run_options(args))
+        print(f"Gazetteer resolved {extractor.stats['gazetteer_only']} of {extractor.stats['spans']} spans without NER")
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+
+    # Analyze bias
+    entity_label_counts, entity_label_freq_norm = analyze_bias(df)
+
+    # Visualize results
+    visualize_bias(entity_label_counts, entity_label_freq_norm)
+
+if __name__ == "__main__":
+    main()
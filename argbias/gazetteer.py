@@ -0,0 +1,356 @@
+import re
+import json
+import random
+from collections import Counter
+from .checkpoint import list_essays
+from .common import parse_ann_file
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+# Tokens are words (hyphenated words kept whole) or single punctuation marks,
+# so phrases never match across punctuation
+TOKEN_PATTERN = re.compile(r"\w+(?:-\w+)*|[^\w\s]")
+SENTENCE_BREAKS = {".", "!", "?", ":", ";", "\"", "(", "“"}
+TYPE_KEY = "__type__"
+
+# Curated demographic gazetteer, extend with Gazetteer.add/update/load
+DEFAULT_ENTRIES = {
+    "NORP": [
+        # Nationalities and regional groups
+        "American", "Americans", "British", "Briton", "Britons", "English", "Scottish", "Welsh", "Irish",
+        "Canadian", "Canadians", "Mexican", "Mexicans", "Brazilian", "Brazilians", "Argentinian", "Argentinians",
+        "French", "German", "Germans", "Italian", "Italians", "Spanish", "Spaniards", "Portuguese", "Dutch",
+        "Swedish", "Swedes", "Norwegian", "Norwegians", "Danish", "Danes", "Finnish", "Finns", "Polish", "Poles",
+        "Russian", "Russians", "Ukrainian", "Ukrainians", "Greek", "Greeks", "Turkish", "Turks", "Swiss", "Austrian",
+        "Chinese", "Japanese", "Korean", "Koreans", "Vietnamese", "Thai", "Indonesian", "Indonesians", "Filipino",
+        "Filipinos", "Malaysian", "Malaysians", "Singaporean", "Singaporeans", "Indian", "Indians", "Pakistani",
+        "Pakistanis", "Bangladeshi", "Bangladeshis", "Iranian", "Iranians", "Iraqi", "Iraqis", "Israeli", "Israelis",
+        "Palestinian", "Palestinians", "Saudi", "Saudis", "Egyptian", "Egyptians", "Nigerian", "Nigerians",
+        "Kenyan", "Kenyans", "Ethiopian", "Ethiopians", "South African", "South Africans", "Australian",
+        "Australians", "New Zealander", "New Zealanders", "European", "Europeans", "Asian", "Asians", "African",
+        "Africans", "Western", "Westerners", "Eastern", "Arab", "Arabs", "Latino", "Latinos", "Latina", "Latinas",
+        "Hispanic", "Hispanics", "African American", "African Americans", "Native American", "Native Americans",
+        # Religions and religious groups
+        "Christian", "Christians", "Catholic", "Catholics", "Protestant", "Protestants", "Orthodox", "Muslim",
+        "Muslims", "Islamic", "Jewish", "Jews", "Hindu", "Hindus", "Buddhist", "Buddhists", "Sikh", "Sikhs",
+        "Atheist", "Atheists",
+        # Political groups
+        "Democrat", "Democrats", "Republican", "Republicans", "Conservative", "Conservatives", "Liberal",
+        "Liberals", "Socialist", "Socialists", "Communist", "Communists"
+    ],
+    "GPE": [
+        "America", "United States", "United States of America", "USA", "U.S.", "U.S.A.", "United Kingdom", "UK",
+        "U.K.", "Britain", "Great Britain", "England", "Scotland", "Wales", "Ireland", "Canada", "Mexico", "Brazil",
+        "Argentina", "Chile", "Colombia", "Peru", "France", "Germany", "Italy", "Spain", "Portugal", "Netherlands",
+        "Belgium", "Sweden", "Norway", "Denmark", "Finland", "Poland", "Russia", "Ukraine", "Greece", "Turkey",
+        "Switzerland", "Austria", "China", "Japan", "Korea", "South Korea", "North Korea", "Vietnam", "Thailand",
+        "Indonesia", "Philippines", "Malaysia", "Singapore", "India", "Pakistan", "Bangladesh", "Iran", "Iraq",
+        "Israel", "Palestine", "Saudi Arabia", "Egypt", "Nigeria", "Kenya", "Ethiopia", "South Africa",
+        "Australia", "New Zealand", "Europe", "Asia", "Africa", "London", "Paris", "Berlin", "Tokyo", "Beijing",
+        "Shanghai", "Hong Kong", "New York", "Washington", "Los Angeles", "Sydney", "Moscow", "Dubai", "Delhi",
+        "New Delhi", "Mumbai", "Toronto", "Vancouver"
+    ],
+    "ORG": [
+        "United Nations", "UN", "UNESCO", "UNICEF", "World Health Organization", "WHO", "World Bank",
+        "International Monetary Fund", "IMF", "World Trade Organization", "WTO", "European Union", "EU", "NATO",
+        "Red Cross", "Greenpeace", "Amnesty International", "Google", "Apple", "Microsoft", "Amazon", "Facebook",
+        "Meta", "Twitter", "YouTube", "Netflix", "Tesla", "Samsung", "Sony", "Toyota", "McDonald's", "Coca-Cola",
+        "Walmart", "IBM", "Intel", "NASA", "FBI", "CIA", "BBC", "CNN", "Harvard", "Harvard University", "Oxford",
+        "Oxford University", "Cambridge University", "MIT", "Stanford", "Stanford University", "Congress",
+        "Parliament", "Senate"
+    ],
+    "FAC": [
+        "White House", "Pentagon", "Eiffel Tower", "Great Wall", "Statue of Liberty", "Big Ben", "Taj Mahal",
+        "Golden Gate Bridge", "Heathrow", "Heathrow Airport"
+    ],
+    "GENDER": [
+        "man", "men", "woman", "women", "boy", "boys", "girl", "girls", "male", "males", "female", "females",
+        "gentleman", "gentlemen", "lady", "ladies", "father", "fathers", "mother", "mothers", "husband",
+        "husbands", "wife", "wives", "son", "sons", "daughter", "daughters", "brother", "brothers", "sister",
+        "sisters", "businessman", "businessmen", "businesswoman", "businesswomen", "housewife", "housewives"
+    ],
+}
+# Types only the gazetteer knows; spaCy has no label to compare them against
+GAZETTEER_ONLY_TYPES = {"GENDER"}
+
+# Lowercase words that are capitalised at the start of a sentence without
+# being names. FastEntityExtractor adds every word the dataset uses in
+# lowercase (see dataset_vocabulary); a sentence-initial capitalised token
+# outside the vocabulary is treated as a possible name
+COMMON_WORDS = {
+    "a", "an", "the", "this", "that", "these", "those", "it", "its", "there", "here", "they", "them", "their",
+    "we", "our", "us", "you", "your", "he", "she", "his", "her", "him", "my", "me", "one", "ones", "someone",
+    "everyone", "anyone", "nobody", "people", "some", "many", "most", "much", "more", "less", "few", "several",
+    "all", "each", "every", "both", "either", "neither", "any", "no", "none", "not", "other", "others",
+    "another", "such", "same", "what", "which", "who", "whom", "whose", "why", "how", "when", "where",
+    "whether", "and", "but", "or", "nor", "so", "yet", "for", "if", "unless", "because", "since", "as",
+    "although", "though", "while", "whereas", "after", "before", "until", "once", "then", "than", "thus",
+    "hence", "therefore", "however", "moreover", "furthermore", "besides", "additionally", "also", "finally",
+    "first", "firstly", "second", "secondly", "third", "thirdly", "last", "lastly", "next", "meanwhile",
+    "consequently", "accordingly", "nevertheless", "nonetheless", "instead", "otherwise", "similarly",
+    "likewise", "indeed", "overall", "generally", "personally", "obviously", "clearly", "certainly",
+    "surely", "perhaps", "maybe", "undoubtedly", "admittedly", "fortunately", "unfortunately", "today",
+    "nowadays", "currently", "recently", "still", "even", "only", "just", "in", "on", "at", "by", "from",
+    "to", "of", "with", "without", "within", "through", "during", "despite", "about", "against", "among",
+    "between", "into", "over", "under", "upon", "via", "is", "are", "was", "were", "be", "been", "being",
+    "has", "have", "had", "having", "do", "does", "did", "can", "could", "should", "would", "will", "shall",
+    "may", "might", "must", "let", "yes", "well", "example", "conclusion", "summary", "addition", "fact",
+    "students", "children", "parents", "teachers", "schools", "governments", "government", "society",
+    "technology", "education", "companies", "workers", "individuals", "families", "countries", "cities",
+    # Ordinary words that are also gazetteer names ("Apple pie", "Turkey is roasted")
+    "apple", "amazon", "meta", "turkey", "conservative", "conservatives", "liberal", "liberals", "western",
+    "eastern", "orthodox",
+}
+
+def tokenize(text):
+    """
+    Split text into (token, start, end) triples.
+    """
+    return [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+class Gazetteer:
+    """
+    Phrase gazetteer compiled into a token trie for longest-match lookup.
+
+    The trie is keyed by lowercased tokens, but each phrase keeps its original
+    spelling: lowercase tokens match in any case, all-caps tokens ("WHO",
+    "UN") only match exactly, and other capitalised tokens ("Turkey",
+    "McDonald") must match their spelling, so "Who" is not WHO and "turkey"
+    is not Turkey.
+    """
+
+    def __init__(self, entries=None):
+        self.trie = {}
+        self.size = 0
+        self.update(DEFAULT_ENTRIES if entries is None else entries)
+
+    def add(self, phrase, ent_type):
+        """
+        Add a phrase with its entity type (a later add of the same spelling overrides the type).
+        """
+        tokens = tuple(token for token, _, _ in tokenize(phrase))
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        spellings = node.setdefault(TYPE_KEY, {})
+        if tokens not in spellings:
+            self.size += 1
+        spellings[tokens] = ent_type
+
+    def update(self, entries):
+        """
+        Add every phrase of an {entity type: [phrases]} mapping.
+        """
+        for ent_type, phrases in entries.items():
+            for phrase in phrases:
+                self.add(phrase, ent_type)
+
+    def load(self, path):
+        """
+        Add phrases from a JSON file ({type: [phrases]}) or a tab-separated "phrase<TAB>type" file.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                self.update(json.load(f))
+                return
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 2 and parts[0] and not parts[0].startswith("#"):
+                    self.add(parts[0], parts[1])
+
+    def match(self, text, types=None):
+        """
+        Longest non-overlapping gazetteer matches as (text, type, start, end) tuples.
+        """
+        tokens = tokenize(text)
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            best = None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j][0].lower())
+                if node is None:
+                    break
+                j += 1
+                for spelling, ent_type in node.get(TYPE_KEY, {}).items():
+                    if all(_case_matches(expected, token) for expected, (token, _, _) in zip(spelling, tokens[i:j])):
+                        best = (j, ent_type)
+                        break
+            if best is not None:
+                end, ent_type = best
+                if types is None or ent_type in types:
+                    start_char, end_char = tokens[i][1], tokens[end - 1][2]
+                    matches.append((text[start_char:end_char], ent_type, start_char, end_char))
+                    i = end
+                    continue
+            i += 1
+        return matches
+
+    def extract_entities(self, text, types=None):
+        """
+        Gazetteer-only counterpart of extract_named_entities.
+        """
+        return [(entity, ent_type) for entity, ent_type, _, _ in self.match(text, types)]
+
+def _case_matches(expected, token):
+    return expected.islower() or token == expected
+
+def sentence_starts(tokens):
+    """
+    Start offsets of the tokens that begin a sentence.
+    """
+    starts = set()
+    previous = None
+    for token, start, _ in tokens:
+        if previous is None or previous in SENTENCE_BREAKS:
+            starts.add(start)
+        previous = token
+    return starts
+
+def dataset_vocabulary(dataset_path):
+    """
+    COMMON_WORDS plus every word the dataset's essays use in lowercase.
+
+    A sentence-initial "Students" is then known to be an ordinary word, while
+    a name like "Einstein" that never appears in lowercase is not.
+    """
+    vocabulary = set(COMMON_WORDS)
+    for _, text_filepath, _ in list_essays(dataset_path):
+        with open(text_filepath, "r", encoding="utf-8") as f:
+            vocabulary.update(token for token, _, _ in tokenize(f.read()) if token.islower())
+    return vocabulary
+
+def ambiguous_matches(text, matches, vocabulary=COMMON_WORDS):
+    """
+    Sentence-initial matches that are also ordinary words ("Apple pie ...").
+
+    Capitalisation says nothing at a sentence start, so these are left to
+    statistical NER rather than counted as entities.
+    """
+    starts = sentence_starts(tokenize(text))
+    return [m for m in matches if m[2] in starts and m[0].lower() in vocabulary]
+
+def unresolved_names(text, matches, vocabulary=COMMON_WORDS):
+    """
+    Capitalised tokens that no gazetteer match covers.
+
+    These are likely names (people, organisations, places) that the gazetteer
+    cannot resolve, so the span should be handed to statistical NER. At a
+    sentence start only tokens outside ``vocabulary`` (and not used in
+    lowercase elsewhere in the text) count, so "Einstein said so" falls back
+    to NER while "However, ..." does not.
+    """
+    tokens = tokenize(text)
+    starts = sentence_starts(tokens)
+    lowercase = {token for token, _, _ in tokens if token.islower()}
+    covered = [(start, end) for _, _, start, end in matches]
+    unresolved = []
+    for token, start, end in tokens:
+        common = start in starts and (token.lower() in vocabulary or token.lower() in lowercase)
+        if (token[:1].isupper() and token != "I" and not common
+                and not any(s <= start and end <= e for s, e in covered)):
+            unresolved.append(token)
+    return unresolved
+
+class FastEntityExtractor:
+    """
+    Gazetteer-first entity extractor with optional statistical NER fallback.
+
+    Spans whose entities the gazetteer fully resolves never reach spaCy; spans
+    with unresolved capitalised names are run through ``nlp`` (when given) and
+    its entities replace the gazetteer matches they overlap. A name is
+    resolved by a gazetteer match of any type, but only entities of ``types``
+    are returned. Sentence-initial matches that are ordinary words of
+    ``vocabulary`` (e.g. from dataset_vocabulary) are ambiguous and also go
+    to NER, or are dropped without ``nlp``.
+
+    ``stats`` counts spans, spans the gazetteer resolved alone
+    (``gazetteer_only``), spans that needed NER (``unresolved``) and spans
+    actually run through NER (``ner_fallback``).
+    """
+
+    def __init__(self, gazetteer=None, nlp=None, types=None, vocabulary=None):
+        self.gazetteer = gazetteer if gazetteer is not None else Gazetteer()
+        self.nlp = nlp
+        self.types = set(types) if types is not None else None
+        self.vocabulary = vocabulary if vocabulary is not None else COMMON_WORDS
+        self.stats = Counter()
+
+    @property
+    def mode(self):
+        """
+        Description of the extractor's configuration, recorded in run checkpoints.
+        """
+        backend = "gazetteer+ner" if self.nlp is not None else "gazetteer"
+        types = ",".join(sorted(self.types)) if self.types is not None else "all"
+        return f"{backend}[{types}]"
+
+    def __call__(self, text):
+        matches = self.gazetteer.match(text)
+        ambiguous = ambiguous_matches(text, matches, self.vocabulary)
+        if ambiguous:
+            matches = [m for m in matches if m not in ambiguous]
+        resolved = not ambiguous and not unresolved_names(text, matches, self.vocabulary)
+        if self.types is not None:
+            matches = [m for m in matches if m[1] in self.types]
+        self.stats["spans"] += 1
+        if not resolved:
+            self.stats["unresolved"] += 1
+        if self.nlp is None or resolved:
+            if resolved:
+                self.stats["gazetteer_only"] += 1
+            return [(entity, ent_type) for entity, ent_type, _, _ in matches]
+
+        self.stats["ner_fallback"] += 1
+        doc = self.nlp(text)
+        ents = [(ent.text, ent.label_, ent.start_char, ent.end_char) for ent in doc.ents
+                if self.types is None or ent.label_ in self.types]
+        kept = [m for m in matches if not any(m[2] < e and s < m[3] for _, _, s, e in ents)]
+        merged = sorted(ents + kept, key=lambda m: m[2])
+        return [(entity, ent_type) for entity, ent_type, _, _ in merged]
+
+def sample_texts(dataset_path, n, seed=0):
+    """
+    A reproducible random sample of ``n`` annotated component texts from the dataset.
+    """
+    texts = [ann["text"] for _, _, ann_filepath in list_essays(dataset_path)
+             for ann in parse_ann_file(ann_filepath)]
+    return random.Random(seed).sample(texts, min(n, len(texts)))
+
+def agreement_report(texts, extractor, nlp, types):
+    """
+    Compare an extractor against full spaCy NER over ``texts``.
+
+    Entities are compared as (text, type) multisets per span. Returns
+    precision, recall and F1 per entity type plus an "ALL" row; types in
+    GAZETTEER_ONLY_TYPES are left out, as spaCy never produces them.
+    """
+    types = [ent_type for ent_type in types if ent_type not in GAZETTEER_ONLY_TYPES]
+    true_pos, predicted, expected = Counter(), Counter(), Counter()
+    for text in texts:
+        fast = Counter(e for e in extractor(text) if e[1] in types)
+        full = Counter((ent.text, ent.label_) for ent in nlp(text).ents if ent.label_ in types)
+        for (_, ent_type), count in (fast & full).items():
+            true_pos[ent_type] += count
+        for (_, ent_type), count in fast.items():
+            predicted[ent_type] += count
+        for (_, ent_type), count in full.items():
+            expected[ent_type] += count
+
+    rows = []
+    for ent_type in list(types) + ["ALL"]:
+        if ent_type == "ALL":
+            tp, pred, exp = sum(true_pos.values()), sum(predicted.values()), sum(expected.values())
+        else:
+            tp, pred, exp = true_pos[ent_type], predicted[ent_type], expected[ent_type]
+        precision = tp / pred if pred else float("nan")
+        recall = tp / exp if exp else float("nan")
+        f1 = 2 * tp / (pred + exp) if pred + exp else float("nan")
+        rows.append({"Type": ent_type, "Fast": pred, "NER": exp, "Agreed": tp,
+                     "Precision": precision, "Recall": recall, "F1": f1})
+    return pd.DataFrame(rows)
@@ -0,0 +1,37 @@
+import importlib
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Lets heavy dependencies (spaCy, TextBlob, matplotlib, seaborn, scipy, ...)
+    be declared at the top of a module without paying their import cost until
+    a function actually uses them.
+    """
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    """
+    Return a LazyModule for ``name``, e.g. ``plt = lazy_import("matplotlib.pyplot")``.
+    """
+    return LazyModule(name)
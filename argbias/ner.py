@@ -0,0 +1,39 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, extract_named_entities, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+def process_essay(file, text_filepath, ann_filepath):
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        entities = extract_named_entities(ann["text"])
+        for entity, ent_type in entities:
+            rows.append({"Essay": file, "Label": ann["label"], "Entity": entity, "Type": ent_type})
+    return rows, len(annotations)
+
+def process_dataset(dataset_path, **run_kwargs):
+    results = run_essays(dataset_path, process_essay, "argbias.ner", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+def visualize_entity_distribution(df):
+    plt.figure(figsize=(10, 5))
+    sns.countplot(data=df, x="Type", order=df["Type"].value_counts().index)
+    plt.title("Entity Distribution in Argument Components")
+    plt.xticks(rotation=45)
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("Named entity distribution in argument components", checkpoint=True, store=True).parse_args(argv)
+    if args.store:
+        df = load_for(args.store, visualize_entity_distribution)
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+    visualize_entity_distribution(df)
+
+if __name__ == "__main__":
+    main()
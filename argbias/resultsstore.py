@@ -0,0 +1,237 @@
+import os
+import json
+import shutil
+from urllib.parse import quote
+from .checkpoint import function_id, run_essays, run_options
+from .common import get_sentiment, extract_named_entities, categorize_topic, make_parser, parse_ann_graph
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+PARTITION_COLS = ["Topic", "Label"]
+
+# Table and columns each analysis function reads, so it can be fed straight from
+# the store. Visualisations of derived results (PMI scores, normalised
+# frequencies) map to the rows those results are computed from
+ANALYSIS_INPUTS = {
+    "visualize_entity_distribution": ("entities", ["Type"]),
+    "analyze_entity_bias": ("entities", ["Type", "Label"]),
+    "calculate_pmi": ("entities", ["Type", "Label"]),
+    "analyze_entity_influence": ("entities", ["Type", "Label"]),
+    "analyze_bias": ("entities", ["Type", "Label"]),
+    "chi_square_test": ("entities", ["Type", "Label"]),
+    "visualize_entity_distribution_by_topic": ("entities", ["Type", "Topic"]),
+    "visualize_bias_distribution": ("entities", ["Type", "Label"]),
+    "visualize_pmi_scores": ("entities", ["Type", "Label"]),
+    "visualize_entity_influence": ("entities", ["Type", "Label"]),
+    "visualize_bias": ("entities", ["Type", "Label"]),
+    "perform_anova": ("annotations", ["Label", "Sentiment"]),
+    "visualize_sentiment_distribution": ("annotations", ["Label", "Sentiment"]),
+    "visualize_sentiment_variability": ("annotations", ["Topic", "Label", "Sentiment"]),
+}
+
+def build_tables(dataset_path, sentiment_fn=None, entity_fn=None, topic_fn=None, **run_kwargs):
+    """
+    Build the canonical annotation and entity tables for the dataset.
+
+    ``annotations`` has one row per argument component (with its sentiment when
+    ``sentiment_fn`` is given); ``entities`` has one row per named entity found
+    by ``entity_fn`` inside a component. Extra keyword arguments (checkpointing,
+    progress) are passed to run_essays.
+    """
+    def process_essay(file, text_filepath, ann_filepath):
+        topic = "Other"
+        if topic_fn:
+            with open(text_filepath, "r", encoding="utf-8") as f:
+                topic = topic_fn(f.read())
+
+        annotations = []
+        entities = []
+        components, _, _ = parse_ann_graph(ann_filepath)
+        for ann in components:
+            annotations.append({
+                "Essay": file,
+                "Topic": topic,
+                "Label": ann["label"],
+                "Id": ann["id"],
+                "Start": ann["start"],
+                "End": ann["end"],
+                "Text": ann["text"],
+                "Sentiment": sentiment_fn(ann["text"]) if sentiment_fn else float("nan")
+            })
+            if entity_fn:
+                for entity, ent_type in entity_fn(ann["text"]):
+                    entities.append({
+                        "Essay": file,
+                        "Topic": topic,
+                        "Label": ann["label"],
+                        "Id": ann["id"],
+                        "Entity": entity,
+                        "Type": ent_type
+                    })
+        return {"annotations": annotations, "entities": entities}, len(components)
+
+    config = {"sentiment": function_id(sentiment_fn), "entities": function_id(entity_fn),
+              "topic": function_id(topic_fn)}
+    results = run_essays(dataset_path, process_essay, "argbias.resultsstore", config=config, **run_kwargs)
+    annotations = pd.DataFrame([row for result in results for row in result["annotations"]],
+                               columns=["Essay", "Topic", "Label", "Id", "Start", "End", "Text", "Sentiment"])
+    entities = pd.DataFrame([row for result in results for row in result["entities"]],
+                            columns=["Essay", "Topic", "Label", "Id", "Entity", "Type"])
+    return {"annotations": annotations, "entities": entities}
+
+def read_manifest(store_path):
+    """
+    Read the store manifest, or return an empty one if the store does not exist yet.
+    """
+    manifest_path = os.path.join(store_path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {"version": MANIFEST_VERSION, "tables": {}}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported store manifest version: {manifest.get('version')}")
+    return manifest
+
+def _write_manifest(store_path, manifest):
+    manifest_path = os.path.join(store_path, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def write_table(store_path, name, df, partition_cols=PARTITION_COLS):
+    """
+    Write a table as Parquet files partitioned by ``partition_cols`` and record it in the manifest.
+
+    Partition columns missing from ``df`` are skipped. The new version is
+    written to a temporary directory and renamed into place with os.replace,
+    so a failed write leaves any previous version of the table intact; the
+    manifest is only updated once the new files are in place.
+    """
+    partition_cols = [col for col in partition_cols if col in df.columns]
+    table_dir = os.path.join(store_path, name)
+    tmp_dir = table_dir + ".tmp"
+    old_dir = table_dir + ".old"
+    for leftover in (tmp_dir, old_dir):
+        if os.path.exists(leftover):
+            shutil.rmtree(leftover)
+    os.makedirs(tmp_dir)
+
+    data_cols = [col for col in df.columns if col not in partition_cols]
+    groups = df.groupby(partition_cols, sort=True, dropna=False) if partition_cols else [((), df)]
+    partitions = []
+    for values, part in groups:
+        if not isinstance(values, tuple):
+            values = (values,)
+        values = {col: (None if pd.isna(value) else str(value)) for col, value in zip(partition_cols, values)}
+        part_dir = os.path.join("", *[f"{col}={quote(str(value), safe='')}" for col, value in values.items()])
+        os.makedirs(os.path.join(tmp_dir, part_dir), exist_ok=True)
+        part_path = os.path.join(part_dir, "part-0.parquet")
+        part[data_cols].reset_index(drop=True).to_parquet(os.path.join(tmp_dir, part_path), index=False)
+        partitions.append({"path": os.path.join(name, part_path), "values": values, "rows": len(part)})
+
+    # A directory can't be renamed over a non-empty one, so the old version is
+    # moved aside first and removed once the manifest points at the new files
+    if os.path.exists(table_dir):
+        os.replace(table_dir, old_dir)
+    os.replace(tmp_dir, table_dir)
+
+    manifest = read_manifest(store_path)
+    manifest["tables"][name] = {
+        "columns": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "partition_cols": partition_cols,
+        "rows": len(df),
+        "partitions": partitions
+    }
+    _write_manifest(store_path, manifest)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+
+def write_store(store_path, tables, partition_cols=PARTITION_COLS):
+    """
+    Write every table of ``tables`` (name -> DataFrame) to the store.
+    """
+    os.makedirs(store_path, exist_ok=True)
+    for name, df in tables.items():
+        write_table(store_path, name, df, partition_cols)
+
+def load_table(store_path, name, columns=None, filters=None):
+    """
+    Load a table from the store, reading only the needed columns and partitions.
+
+    ``filters`` maps column names to a value or list of accepted values.
+    Filters on partition columns skip whole partitions; other filters are
+    passed to the Parquet reader, which skips row groups that cannot match.
+    """
+    manifest = read_manifest(store_path)
+    if name not in manifest["tables"]:
+        raise KeyError(f"Table '{name}' not found in store {store_path}")
+    table = manifest["tables"][name]
+    partition_cols = table["partition_cols"]
+    filters = {col: (list(value) if isinstance(value, (list, tuple, set)) else [value])
+               for col, value in (filters or {}).items()}
+
+    columns = list(columns) if columns is not None else list(table["columns"])
+    missing = [col for col in list(columns) + list(filters) if col not in table["columns"]]
+    if missing:
+        raise KeyError(f"Columns {missing} not found in table '{name}'")
+    read_cols = [col for col in dict.fromkeys(columns + list(filters)) if col not in partition_cols]
+    row_filters = [(col, "in", accepted) for col, accepted in filters.items() if col not in partition_cols]
+
+    frames = []
+    for part in table["partitions"]:
+        values = part["values"]
+        if any(col in values and values[col] not in [str(v) for v in accepted]
+               for col, accepted in filters.items()):
+            continue
+        if read_cols:
+            df = pd.read_parquet(os.path.join(store_path, part["path"]), columns=read_cols,
+                                 filters=row_filters or None)
+        else:
+            df = pd.DataFrame(index=pd.RangeIndex(part["rows"]))
+        for col in partition_cols:
+            if col in columns or col in filters:
+                df[col] = values[col]
+        frames.append(df)
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=list(dict.fromkeys(columns + list(filters))))
+    # Partition values are stored as strings; restore the original dtypes
+    for col in partition_cols:
+        if col in df.columns and table["columns"][col] != "object":
+            df[col] = df[col].astype(table["columns"][col])
+    return df[columns].reset_index(drop=True)
+
+def load_for(store_path, analysis, filters=None):
+    """
+    Load just the table slice an analysis function needs (see ANALYSIS_INPUTS).
+    """
+    name = analysis if isinstance(analysis, str) else analysis.__name__
+    table, columns = ANALYSIS_INPUTS[name]
+    return load_table(store_path, table, columns, filters)
+
+def run_from_store(store_path, analysis, filters=None, **kwargs):
+    """
+    Run an analysis function directly on the store, e.g.
+    ``run_from_store(store, analyze_bias, filters={"Type": ["PERSON", "NORP"]})``.
+    """
+    return analysis(load_for(store_path, analysis, filters), **kwargs)
+
+def main(argv=None):
+    parser = make_parser("Build the partitioned results store", checkpoint=True)
+    parser.add_argument("--store", default="results-store", help="Directory to write the store to")
+    args = parser.parse_args(argv)
+
+    tables = build_tables(args.dataset_path, get_sentiment, extract_named_entities, categorize_topic,
+                          **run_options(args))
+    write_store(args.store, tables)
+    for name, table in read_manifest(args.store)["tables"].items():
+        print(f"{name}: {table['rows']} rows in {len(table['partitions'])} partitions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, get_sentiment, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Function to score the sentiment of one essay's components
+def process_essay(file, text_filepath, ann_filepath):
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        sentiment = get_sentiment(ann["text"])
+        rows.append({"Essay": file, "Label": ann["label"], "Sentiment": sentiment})
+    return rows, len(annotations)
+
+# Function to process dataset and analyze sentiment
+def process_sentiment_analysis(dataset_path, **run_kwargs):
+    results = run_essays(dataset_path, process_essay, "argbias.sentimentanalysis", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+# Function to visualize sentiment distribution
+def visualize_sentiment_distribution(df):
+    plt.figure(figsize=(10, 5))
+    sns.boxplot(data=df, x="Label", y="Sentiment")
+    plt.title("Sentiment Distribution Across Argument Components")
+    plt.axhline(0, color='red', linestyle='dashed')
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("Sentiment distribution across argument components", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, or load its sentiment scores from the results store
+    if args.store:
+        df = load_for(args.store, visualize_sentiment_distribution)
+    else:
+        df = process_sentiment_analysis(args.dataset_path, **run_options(args))
+
+    # Generate visualization
+    visualize_sentiment_distribution(df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, get_sentiment, categorize_topic, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Function to score the sentiment of one essay's components
+def process_essay(file, text_filepath, ann_filepath):
+    with open(text_filepath, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    rows = []
+    topic = categorize_topic(text)
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        sentiment = get_sentiment(ann["text"])
+        rows.append({"Essay": file, "Topic": topic, "Label": ann["label"], "Sentiment": sentiment})
+    return rows, len(annotations)
+
+# Function to process dataset and analyze sentiment variability
+def process_sentiment_variability(dataset_path, **run_kwargs):
+    results = run_essays(dataset_path, process_essay, "argbias.sentimentvariability", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+# Function to visualize sentiment variability across topics
+def visualize_sentiment_variability(df):
+    plt.figure(figsize=(12, 6))
+    sns.boxplot(data=df, x="Topic", y="Sentiment", hue="Label")
+    plt.title("Sentiment Variability Across Topics")
+    plt.axhline(0, color='red', linestyle='dashed')
+    plt.xticks(rotation=45)
+    plt.show()
+
+def main(argv=None):
+    args = make_parser("Sentiment variability across essay topics", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, or load its sentiment scores from the results store
+    if args.store:
+        df = load_for(args.store, visualize_sentiment_variability)
+    else:
+        df = process_sentiment_variability(args.dataset_path, **run_options(args))
+
+    # Generate visualization
+    visualize_sentiment_variability(df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+from .batchtesting import batch_anova, chi_square_results
+from .biasquantification import INFLUENCE_ENTITY_TYPES, visualize_pmi_scores, visualize_entity_influence
+from .checkpoint import list_essays, add_checkpoint_arguments, run_options
+from .common import DATASET_PATH_HELP, get_sentiment, extract_named_entities, categorize_topic
+from .ethicalnalysis import BIAS_ENTITY_TYPES, visualize_bias
+from .lazy import lazy_import
+from .resultsstore import build_tables
+from .sketches import EntitySketches
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PARTIAL_VERSION = 1
+ENTITY_KEYS = ["Topic", "Label", "Type"]
+MOMENT_KEYS = ["Topic", "Label"]
+# Final tables whose index carries data (entity type) and is kept when written out
+INDEXED_TABLES = {"entity_label_counts", "entity_influence", "entity_influence_norm", "bias_counts", "bias_freq_norm"}
+
+def shard_of(file, num_shards):
+    """
+    Stable hash shard of an essay filename (independent of PYTHONHASHSEED).
+    """
+    digest = hashlib.md5(file.encode("utf-8")).hexdigest()
+    return int(digest, 16) % num_shards
+
+def shard_essays(essays, shard, num_shards, method="hash"):
+    """
+    The essays (from list_essays) that belong to ``shard`` of ``num_shards``.
+
+    ``hash`` spreads essays by filename hash; ``range`` gives each shard a
+    contiguous block of the sorted essay list.
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"Shard {shard} out of range for {num_shards} shards")
+    if method == "hash":
+        return [essay for essay in essays if shard_of(essay[0], num_shards) == shard]
+    if method == "range":
+        bounds = np.linspace(0, len(essays), num_shards + 1).round().astype(int)
+        return essays[bounds[shard]:bounds[shard + 1]]
+    raise ValueError(f"Unknown sharding method: {method}")
+
+def aggregate_tables(tables):
+    """
+    Reduce the annotation and entity tables to mergeable counts and moments.
+
+    Entity counts per (Topic, Label, Type) feed the PMI, entity-influence,
+    bias and chi-square tables; sentiment count/sum/sum of squares per
+    (Topic, Label) feed the ANOVA.
+    """
+    entities = tables["entities"]
+    entity_counts = entities.groupby(ENTITY_KEYS).size().reset_index(name="Count")
+
+    annotations = tables["annotations"]
+    annotations = annotations[annotations["Sentiment"].notna()].assign(
+        SumSq=lambda df: df["Sentiment"] ** 2)
+    moments = annotations.groupby(MOMENT_KEYS).agg(
+        Count=("Sentiment", "size"), Sum=("Sentiment", "sum"), SumSq=("SumSq", "sum")).reset_index()
+
+    return {
+        "annotations": len(tables["annotations"]),
+        "entity_counts": entity_counts.values.tolist(),
+        "moments": moments.values.tolist(),
+    }
+
+def write_partial(path, partial):
+    """
+    Write a partial aggregate atomically, so a half-written file is never reduced.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(partial, f)
+    os.replace(tmp_path, path)
+
+def read_partial(path):
+    with open(path, "r", encoding="utf-8") as f:
+        partial = json.load(f)
+    if partial.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"Unsupported partial version in {path}: {partial.get('version')}")
+    return partial
+
+def map_shard(dataset_path, output_path, shard=0, num_shards=1, method="hash", entity_fn=None, sketches=False,
+              **run_kwargs):
+    """
+    Process one shard of essays and write its partial aggregate to ``output_path``.
+
+    With ``sketches`` the partial also carries fixed-size entity sketches
+    (top entities and distinct counts per Label/Type/Topic).
+    """
+    essays = shard_essays(list_essays(dataset_path), shard, num_shards, method)
+    tables = build_tables(dataset_path, get_sentiment, entity_fn or extract_named_entities, categorize_topic,
+                          essays=essays, **run_kwargs)
+    partial = aggregate_tables(tables)
+    partial.update({"version": PARTIAL_VERSION, "shard": shard, "num_shards": num_shards, "method": method,
+                    "essays": [file for file, _, _ in essays]})
+    if sketches:
+        partial["sketches"] = EntitySketches().update_frame(tables["entities"]).to_dict()
+    write_partial(output_path, partial)
+    return partial
+
+def merge_partials(partials):
+    """
+    Merge partial aggregates of every shard into one aggregate.
+
+    Raises ValueError if shards are missing, duplicated, disagree on the
+    sharding scheme or on whether they carry sketches, or overlap in essays.
+    """
+    if not partials:
+        raise ValueError("No partial aggregates to merge")
+    num_shards = partials[0]["num_shards"]
+    method = partials[0]["method"]
+    if any(p["num_shards"] != num_shards or p["method"] != method for p in partials):
+        raise ValueError("Partial aggregates come from different sharding schemes")
+    with_sketches = ["sketches" in p for p in partials]
+    if any(with_sketches) and not all(with_sketches):
+        raise ValueError("Only some partial aggregates carry sketches; rerun the map step of every shard "
+                         "with the same --sketches setting")
+    shards = sorted(p["shard"] for p in partials)
+    if shards != list(range(num_shards)):
+        raise ValueError(f"Expected shards 0..{num_shards - 1}, got {shards}")
+
+    essays = [essay for p in partials for essay in p["essays"]]
+    if len(essays) != len(set(essays)):
+        raise ValueError("Shards overlap: some essays were processed more than once")
+
+    entity_counts = pd.DataFrame([row for p in partials for row in p["entity_counts"]],
+                                 columns=ENTITY_KEYS + ["Count"])
+    entity_counts = entity_counts.groupby(ENTITY_KEYS, as_index=False)["Count"].sum()
+    moments = pd.DataFrame([row for p in partials for row in p["moments"]],
+                           columns=MOMENT_KEYS + ["Count", "Sum", "SumSq"])
+    moments = moments.groupby(MOMENT_KEYS, as_index=False)[["Count", "Sum", "SumSq"]].sum()
+
+    aggregate = {
+        "essays": sorted(essays),
+        "annotations": sum(p["annotations"] for p in partials),
+        "entity_counts": entity_counts,
+        "moments": moments,
+    }
+    if all(with_sketches):
+        sketches = EntitySketches.from_dict(partials[0]["sketches"])
+        for p in partials[1:]:
+            sketches.merge(EntitySketches.from_dict(p["sketches"]))
+        aggregate["sketches"] = sketches
+    return aggregate
+
+def entity_label_table(entity_counts, entity_types=None):
+    """
+    Type x Label occurrence counts summed from entity counts.
+
+    Same table as ``groupby(["Type", "Label"]).size().unstack(fill_value=0)``
+    on the expanded occurrences, optionally restricted to ``entity_types``.
+    """
+    if entity_types is not None:
+        entity_counts = entity_counts[entity_counts["Type"].isin(entity_types)]
+    return entity_counts.groupby(["Type", "Label"])["Count"].sum().unstack(fill_value=0)
+
+def normalize_by_label(table):
+    return table.div(table.sum(axis=0), axis=1)
+
+def pmi_from_table(table):
+    """
+    PMI of every observed (Type, Label) pair from a Type x Label count table.
+
+    Computed term by term as calculate_pmi does, so the scores are identical.
+    """
+    total = int(table.to_numpy().sum())
+    type_totals = table.sum(axis=1)
+    label_totals = table.sum(axis=0)
+    pmi_scores = {}
+    for (ent_type, label), count in table.stack().items():
+        if count:
+            p_entity_label = int(count) / total
+            p_entity = int(type_totals[ent_type]) / total
+            p_label = int(label_totals[label]) / total
+            pmi_scores[(ent_type, label)] = np.log2(p_entity_label / (p_entity * p_label))
+    return pmi_scores
+
+def anova_from_moments(moments, by=()):
+    """
+    ANOVA of sentiment across labels from merged moments, per slice of ``by``.
+    """
+    by = list(by)
+    data = moments if by else moments.assign(All=0)
+    pivot = data.pivot_table(index=by or ["All"], columns="Label", values=["Count", "Sum", "SumSq"],
+                                aggfunc="sum", fill_value=0)
+    keys = pivot.index.to_frame(index=False) if by else pd.DataFrame(index=[0])
+    f_stats, df_between, df_within, p_values, n_total = batch_anova(
+        pivot["Count"].to_numpy(), pivot["Sum"].to_numpy(), pivot["SumSq"].to_numpy())
+    results = keys
+    results["Statistic"] = f_stats
+    results["DoF"] = df_between
+    results["DoF2"] = df_within
+    results["N"] = n_total.astype(np.int64)
+    results["PValue"] = p_values
+    return results
+
+def final_tables(aggregate):
+    """
+    Final tables and statistics from a merged aggregate.
+
+    The entity tables are summed directly from the (Topic, Label, Type)
+    counts instead of expanding them to one row per occurrence, and are
+    identical to what calculate_pmi, analyze_entity_influence, analyze_bias
+    and chi_square_tests give on the expanded rows
+    (benchmarks/reduce_equivalence.py checks this).
+    """
+    entity_counts = aggregate["entity_counts"]
+    entity_label_counts = entity_label_table(entity_counts)
+    pmi_scores = pmi_from_table(entity_label_counts)
+    pmi = pd.DataFrame([(entity, label, score) for (entity, label), score in pmi_scores.items()],
+                       columns=["Entity", "Label", "PMI"])
+    entity_influence = entity_label_table(entity_counts, INFLUENCE_ENTITY_TYPES)
+    bias_counts = entity_label_table(entity_counts, BIAS_ENTITY_TYPES)
+
+    tables = {
+        "entity_counts": entity_counts,
+        "entity_label_counts": entity_label_counts,
+        "pmi": pmi.sort_values(["Entity", "Label"], ignore_index=True),
+        "entity_influence": entity_influence,
+        "entity_influence_norm": normalize_by_label(entity_influence),
+        "bias_counts": bias_counts,
+        "bias_freq_norm": normalize_by_label(bias_counts),
+        "chi_square": chi_square_results(entity_label_counts.to_numpy()[None], pd.DataFrame(index=[0])),
+        "anova": anova_from_moments(aggregate["moments"]),
+        "anova_by_topic": anova_from_moments(aggregate["moments"], ["Topic"]),
+    }
+    if "sketches" in aggregate:
+        tables["top_entities"] = aggregate["sketches"].top_entities()
+        tables["distinct_entities"] = aggregate["sketches"].distinct_counts()
+    return tables
+
+def reduce_partials(paths, output_dir=None, plot=False):
+    """
+    Merge partial aggregate files and produce the final tables.
+
+    Tables are written as CSV to ``output_dir`` when given; ``plot`` draws the
+    same figures as the single-node entity analyses.
+    """
+    aggregate = merge_partials([read_partial(path) for path in paths])
+    tables = final_tables(aggregate)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        for name, table in tables.items():
+            if name != "entity_counts":
+                table.to_csv(os.path.join(output_dir, f"{name}.csv"), index=name in INDEXED_TABLES)
+
+    if plot:
+        pmi = tables["pmi"]
+        visualize_pmi_scores(dict(zip(zip(pmi["Entity"], pmi["Label"]), pmi["PMI"])))
+        visualize_entity_influence(tables["entity_influence_norm"])
+        visualize_bias(tables["bias_counts"], tables["bias_freq_norm"])
+    return aggregate, tables
+
+def partial_path(work_dir, shard, num_shards):
+    return os.path.join(work_dir, f"partial-{shard:05d}-of-{num_shards:05d}.json")
+
+def run_local(dataset_path, num_shards, work_dir, method="hash", output_dir=None, plot=False, sketches=False):
+    """
+    Stand in for a multi-node run: one map process per shard, then reduce.
+    """
+    processes = []
+    for shard in range(num_shards):
+        command = [sys.executable, "-m", "argbias.sharding", "map", dataset_path,
+                   "--shard", str(shard), "--num-shards", str(num_shards), "--method", method,
+                   "--output", partial_path(work_dir, shard, num_shards), "--no-progress"]
+        if sketches:
+            command.append("--sketches")
+        processes.append(subprocess.Popen(command))
+    failed = [shard for shard, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        raise RuntimeError(f"Map step failed for shards {failed}")
+    paths = [partial_path(work_dir, shard, num_shards) for shard in range(num_shards)]
+    return reduce_partials(paths, output_dir, plot)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded map-reduce run of the bias statistics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    map_parser = commands.add_parser("map", help="Process one shard and write its partial aggregate")
+    map_parser.add_argument("dataset_path", help=DATASET_PATH_HELP)
+    map_parser.add_argument("--shard", type=int, required=True)
+    map_parser.add_argument("--num-shards", type=int, required=True)
+    map_parser.add_argument("--method", choices=["hash", "range"], default="hash")
+    map_parser.add_argument("--output", required=True, help="Partial aggregate file to write")
+    map_parser.add_argument("--sketches", action="store_true", help="Also write top-entity and distinct-count sketches")
+    add_checkpoint_arguments(map_parser)
+
+    reduce_parser = commands.add_parser("reduce", help="Merge partial aggregates into the final tables")
+    reduce_parser.add_argument("partials", nargs="+")
+    reduce_parser.add_argument("--output-dir", help="Directory to write the final tables to")
+    reduce_parser.add_argument("--plot", action="store_true")
+
+    local_parser = commands.add_parser("local", help="Run every shard as a local process, then reduce")
+    local_parser.add_argument("dataset_path", help=DATASET_PATH_HELP)
+    local_parser.add_argument("--num-shards", type=int, default=os.cpu_count() or 1)
+    local_parser.add_argument("--method", choices=["hash", "range"], default="hash")
+    local_parser.add_argument("--work-dir", default="partials")
+    local_parser.add_argument("--output-dir", help="Directory to write the final tables to")
+    local_parser.add_argument("--plot", action="store_true")
+    local_parser.add_argument("--sketches", action="store_true", help="Also sketch top entities and distinct counts")
+
+    args = parser.parse_args(argv)
+    if args.command == "map":
+        partial = map_shard(args.dataset_path, args.output, args.shard, args.num_shards, args.method,
+                            sketches=args.sketches, **run_options(args))
+        print(f"Shard {args.shard}/{args.num_shards}: {len(partial['essays'])} essays, "
+              f"{partial['annotations']} annotations")
+        return
+
+    if args.command == "reduce":
+        aggregate, tables = reduce_partials(args.partials, args.output_dir, args.plot)
+    else:
+        aggregate, tables = run_local(args.dataset_path, args.num_shards, args.work_dir, args.method,
+                                      args.output_dir, args.plot, args.sketches)
+    print(f"{len(aggregate['essays'])} essays, {aggregate['annotations']} annotations")
+    print(tables["chi_square"])
+    print(tables["anova"])
+
+if __name__ == "__main__":
+    main()
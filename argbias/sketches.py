@@ -0,0 +1,467 @@
+import math
+import heapq
+import base64
+import hashlib
+from .checkpoint import list_essays, ProgressReporter
+from .common import parse_ann_file, extract_named_entities, categorize_topic, make_parser
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Dimensions the entity analyses group on, and the groupings sketched by default
+DIMENSIONS = ["Label", "Type", "Topic"]
+DEFAULT_GROUPINGS = [("Label",), ("Topic",), ("Label", "Type")]
+
+def hash128(item, seed=0):
+    """
+    Two stable 64-bit hashes of ``item`` (the same in every process, so sketches merge across shards).
+    """
+    digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16, salt=seed.to_bytes(8, "little")).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+def _encode(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+def _decode(text, dtype, shape):
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).reshape(shape).copy()
+
+class CountMinSketch:
+    """
+    Count-Min sketch: frequency estimates that never undercount.
+
+    With width ceil(e / epsilon) and depth ceil(ln(1 / delta)), an estimate
+    exceeds the true count by more than epsilon * total with probability at
+    most delta.
+    """
+
+    def __init__(self, width, depth, seed=0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    @classmethod
+    def from_error(cls, epsilon=1e-3, delta=1e-2, seed=0):
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), seed)
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+
+    def _columns(self, item):
+        h1, h2 = hash128(item, self.seed)
+        h2 |= 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item, count=1):
+        self.table[self._rows, self._columns(item)] += count
+        self.total += count
+
+    def estimate(self, item):
+        return int(self.table[self._rows, self._columns(item)].min())
+
+    def error_bound(self):
+        """
+        Additive error that holds with probability 1 - delta.
+        """
+        return self.epsilon * self.total
+
+    def merge(self, other):
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions or seeds")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "seed": self.seed, "total": self.total,
+                "table": _encode(self.table)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["width"], data["depth"], data["seed"])
+        sketch.total = data["total"]
+        sketch.table = _decode(data["table"], np.int64, (sketch.depth, sketch.width))
+        return sketch
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent items in fixed memory.
+
+    Tracks at most ``capacity`` items. For a tracked item,
+    ``count - error <= true count <= count``, and every item more frequent
+    than total / capacity is tracked.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def _push(self, item):
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        # Skip heap entries made stale by later increments
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def add(self, item, count=1):
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            min_count, evicted = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = min_count + count
+            self.errors[item] = min_count
+        self._push(item)
+
+    def min_count(self):
+        """
+        Upper bound on the count of any untracked item.
+        """
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def error_bound(self):
+        return self.total / self.capacity
+
+    def merge(self, other):
+        """
+        Merge another summary (mergeable summaries, Agarwal et al. 2012); bounds still hold.
+        """
+        if self.capacity != other.capacity:
+            raise ValueError("Cannot merge Space-Saving summaries with different capacities")
+        self_min, other_min = self.min_count(), other.min_count()
+        counts, errors = {}, {}
+        for item in set(self.counts) | set(other.counts):
+            counts[item] = self.counts.get(item, self_min) + other.counts.get(item, other_min)
+            errors[item] = self.errors.get(item, self_min) + other.errors.get(item, other_min)
+        kept = heapq.nlargest(self.capacity, counts, key=lambda item: (counts[item], item))
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.total += other.total
+        self._rebuild_heap()
+        return self
+
+    def items(self):
+        """
+        Tracked (item, count, error) triples, most frequent first.
+        """
+        return sorted(((item, count, self.errors[item]) for item, count in self.counts.items()),
+                      key=lambda entry: (-entry[1], str(entry[0])))
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "total": self.total,
+                "items": [[item, count, error] for item, count, error in self.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data["capacity"])
+        summary.total = data["total"]
+        for item, count, error in data["items"]:
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary._rebuild_heap()
+        return summary
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2 ** precision one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision=12, seed=0):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.seed = seed
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, item):
+        h, _ = hash128(item, self.seed)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction: linear counting is more accurate here
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other):
+        if (self.precision, self.seed) != (other.precision, other.seed):
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision or seeds")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_dict(self):
+        return {"precision": self.precision, "seed": self.seed, "registers": _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision"], data["seed"])
+        sketch.registers = _decode(data["registers"], np.uint8, (1 << sketch.precision,))
+        return sketch
+
+class HeavyHitters:
+    """
+    Top-k items from Space-Saving candidates with Count-Min estimates.
+
+    Both structures only overcount, so the smaller of the two counts is the
+    tighter upper bound; Space-Saving's count minus its error is a lower bound.
+    """
+
+    def __init__(self, capacity=1000, epsilon=1e-3, delta=1e-2, seed=0):
+        self.summary = SpaceSaving(capacity)
+        self.sketch = CountMinSketch.from_error(epsilon, delta, seed)
+
+    def add(self, item, count=1):
+        self.summary.add(item, count)
+        self.sketch.add(item, count)
+
+    def top(self, n=100):
+        """
+        The ``n`` most frequent items as (item, estimate, lower bound) triples.
+        """
+        rows = []
+        for item, count, error in self.summary.items():
+            rows.append((item, min(count, self.sketch.estimate(item)), count - error))
+        rows.sort(key=lambda row: (-row[1], str(row[0])))
+        return rows[:n]
+
+    @property
+    def total(self):
+        return self.summary.total
+
+    def merge(self, other):
+        self.summary.merge(other.summary)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_dict(self):
+        return {"summary": self.summary.to_dict(), "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        heavy = cls.__new__(cls)
+        heavy.summary = SpaceSaving.from_dict(data["summary"])
+        heavy.sketch = CountMinSketch.from_dict(data["sketch"])
+        return heavy
+
+class EntitySketches:
+    """
+    Fixed-memory entity statistics keyed by Label/Type/Topic groupings.
+
+    For every grouping (e.g. ``("Label", "Type")``) and every value of its
+    dimensions, keeps a HeavyHitters summary of entity strings and a
+    HyperLogLog of distinct entities. Memory grows with the number of
+    dimension values, never with the number of distinct entities.
+    """
+
+    def __init__(self, groupings=DEFAULT_GROUPINGS, capacity=1000, epsilon=1e-3, delta=1e-2, precision=12, seed=0):
+        self.groupings = [tuple(grouping) for grouping in groupings]
+        unknown = {dim for grouping in self.groupings for dim in grouping} - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown sketch dimensions: {sorted(unknown)}")
+        self.params = {"capacity": capacity, "epsilon": epsilon, "delta": delta, "precision": precision, "seed": seed}
+        self.heavy = {}
+        self.distinct = {}
+
+    def _sketches(self, grouping, key):
+        slot = (grouping, key)
+        if slot not in self.heavy:
+            p = self.params
+            self.heavy[slot] = HeavyHitters(p["capacity"], p["epsilon"], p["delta"], p["seed"])
+            self.distinct[slot] = HyperLogLog(p["precision"], p["seed"])
+        return self.heavy[slot], self.distinct[slot]
+
+    def update(self, record):
+        """
+        Add one entity record (a mapping with Entity and the grouping dimensions).
+        """
+        entity = record["Entity"]
+        for grouping in self.groupings:
+            heavy, distinct = self._sketches(grouping, tuple(record[dim] for dim in grouping))
+            heavy.add(entity)
+            distinct.add(entity)
+
+    def update_frame(self, df):
+        for record in df.to_dict("records"):
+            self.update(record)
+        return self
+
+    def merge(self, other):
+        if self.groupings != other.groupings or self.params != other.params:
+            raise ValueError("Cannot merge entity sketches with different groupings or parameters")
+        for slot in other.heavy:
+            heavy, distinct = self._sketches(*slot)
+            heavy.merge(other.heavy[slot])
+            distinct.merge(other.distinct[slot])
+        return self
+
+    def _key_columns(self, grouping, key):
+        row = {"Slicing": " x ".join(grouping)}
+        row.update({dim: None for dim in DIMENSIONS})
+        row.update(dict(zip(grouping, key)))
+        return row
+
+    def top_entities(self, n=100):
+        """
+        Top ``n`` entities per grouping key with estimate, lower bound and error bounds.
+
+        ``ErrorBound`` is the Count-Min bound (epsilon * total, holding with
+        probability 1 - delta); ``CapacityBound`` is the Space-Saving bound
+        (total / capacity) on the overcount of any reported item.
+        """
+        rows = []
+        for (grouping, key), heavy in sorted(self.heavy.items(), key=lambda slot: (slot[0][0], str(slot[0][1]))):
+            for rank, (entity, estimate, lower) in enumerate(heavy.top(n), start=1):
+                row = self._key_columns(grouping, key)
+                row.update({"Rank": rank, "Entity": entity, "Estimate": estimate, "LowerBound": lower,
+                            "ErrorBound": heavy.sketch.error_bound(),
+                            "CapacityBound": heavy.summary.error_bound(), "Total": heavy.total})
+                rows.append(row)
+        return pd.DataFrame(rows, columns=["Slicing"] + DIMENSIONS + ["Rank", "Entity", "Estimate", "LowerBound",
+                                                                     "ErrorBound", "CapacityBound", "Total"])
+
+    def distinct_counts(self):
+        """
+        Estimated number of distinct entities per grouping key with its relative standard error.
+        """
+        rows = []
+        for (grouping, key), distinct in sorted(self.distinct.items(), key=lambda slot: (slot[0][0], str(slot[0][1]))):
+            row = self._key_columns(grouping, key)
+            row.update({"Distinct": distinct.estimate(), "RelativeError": distinct.relative_error()})
+            rows.append(row)
+        return pd.DataFrame(rows, columns=["Slicing"] + DIMENSIONS + ["Distinct", "RelativeError"])
+
+    def to_dict(self):
+        return {
+            "groupings": [list(grouping) for grouping in self.groupings],
+            "params": self.params,
+            "slots": [{"grouping": list(grouping), "key": list(key),
+                       "heavy": self.heavy[(grouping, key)].to_dict(),
+                       "distinct": self.distinct[(grouping, key)].to_dict()}
+                      for grouping, key in self.heavy]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketches = cls(data["groupings"], **data["params"])
+        for slot in data["slots"]:
+            key = (tuple(slot["grouping"]), tuple(slot["key"]))
+            sketches.heavy[key] = HeavyHitters.from_dict(slot["heavy"])
+            sketches.distinct[key] = HyperLogLog.from_dict(slot["distinct"])
+        return sketches
+
+def error_report(sketches, df, n=100):
+    """
+    Check sketch answers against exact counts from an entity DataFrame.
+
+    For every grouping key reports the largest overcount of the reported top
+    entities against the Count-Min and Space-Saving bounds, whether every true
+    count lies within [LowerBound, Estimate], the recall of the exact top
+    ``n``, and the relative error of the distinct count.
+    """
+    top = sketches.top_entities(n)
+    distinct = sketches.distinct_counts()
+    rows = []
+    for grouping in sketches.groupings:
+        grouping = list(grouping)
+        exact = df.groupby(grouping + ["Entity"]).size()
+        exact_distinct = df.groupby(grouping)["Entity"].nunique()
+        slicing = " x ".join(grouping)
+        for key, reported in top[top["Slicing"] == slicing].groupby(grouping):
+            key = key if isinstance(key, tuple) else (key,)
+            counts = exact.loc[key] if len(grouping) > 1 else exact.loc[key[0]]
+            true = counts.reindex(reported["Entity"]).fillna(0).to_numpy()
+            overcount = reported["Estimate"].to_numpy() - true
+            exact_top = set(counts.sort_values(ascending=False, kind="stable").index[:n])
+            # Entities tied with the n-th count may legitimately swap places
+            threshold = counts.sort_values(ascending=False).iloc[min(n, len(counts)) - 1]
+            must_have = {entity for entity in exact_top if counts[entity] > threshold}
+            estimate = distinct[(distinct["Slicing"] == slicing)
+                                & np.logical_and.reduce([distinct[dim] == value for dim, value in zip(grouping, key)])]
+            true_distinct = exact_distinct.loc[key if len(grouping) > 1 else key[0]]
+            rows.append({
+                "Slicing": slicing,
+                **dict(zip(grouping, key)),
+                "MaxOvercount": float(overcount.max()),
+                "ErrorBound": float(reported["ErrorBound"].iloc[0]),
+                "CapacityBound": float(reported["CapacityBound"].iloc[0]),
+                "WithinBounds": bool(((reported["LowerBound"].to_numpy() <= true) & (true <= reported["Estimate"].to_numpy())).all()),
+                "TopRecall": len(set(reported["Entity"]) & must_have) / len(must_have) if must_have else 1.0,
+                "Distinct": float(estimate["Distinct"].iloc[0]),
+                "TrueDistinct": int(true_distinct),
+                "DistinctRelativeError": abs(float(estimate["Distinct"].iloc[0]) - true_distinct) / true_distinct,
+                "ExpectedRelativeError": float(estimate["RelativeError"].iloc[0])
+            })
+    return pd.DataFrame(rows)
+
+def stream_entity_sketches(dataset_path, entity_fn=extract_named_entities, topic_fn=categorize_topic,
+                           sketches=None, progress=True, essays=None):
+    """
+    Sketch entity statistics essay by essay without keeping entity strings in memory.
+    """
+    if sketches is None:
+        sketches = EntitySketches()
+    if essays is None:
+        essays = list_essays(dataset_path)
+    reporter = ProgressReporter(len(essays)) if progress else None
+    for file, text_filepath, ann_filepath in essays:
+        with open(text_filepath, "r", encoding="utf-8") as f:
+            topic = topic_fn(f.read())
+        annotations = parse_ann_file(ann_filepath)
+        for ann in annotations:
+            for entity, ent_type in entity_fn(ann["text"]):
+                sketches.update({"Entity": entity, "Type": ent_type, "Label": ann["label"], "Topic": topic})
+        if reporter:
+            reporter.update(len(annotations))
+    return sketches
+
+def main(argv=None):
+    parser = make_parser("Streaming heavy-hitter and distinct-count sketches of entities")
+    parser.add_argument("--top", type=int, default=100, help="Entities to report per Label/Topic (default: 100)")
+    args = parser.parse_args(argv)
+
+    sketches = stream_entity_sketches(args.dataset_path)
+    top = sketches.top_entities(args.top)
+    print(top[top["Slicing"].isin(["Label", "Topic"])].to_string(index=False))
+    distinct = sketches.distinct_counts()
+    print(distinct[(distinct["Slicing"] == "Label x Type") & (distinct["Type"] == "PERSON")].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from .checkpoint import run_essays, run_options
+from .common import parse_ann_file, get_sentiment, make_parser
+from .resultsstore import load_for
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+stats = lazy_import("scipy.stats")
+
+def process_essay(file, text_filepath, ann_filepath):
+    """
+    Extract one essay's labelled components with their sentiment.
+    """
+    rows = []
+    annotations = parse_ann_file(ann_filepath)
+    for ann in annotations:
+        rows.append({
+            "Essay": file,
+            "Label": ann["label"],
+            "Text": ann["text"],
+            "Sentiment": calculate_sentiment(ann["text"])
+        })
+    return rows, len(annotations)
+
+def process_dataset(dataset_path, **run_kwargs):
+    """
+    Process the dataset to extract labelled components and their sentiment.
+    """
+    results = run_essays(dataset_path, process_essay, "argbias.strengthenclaims", **run_kwargs)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+def calculate_sentiment(text):
+    """
+    Calculate sentiment polarity using TextBlob.
+    """
+    return get_sentiment(text)
+
+def chi_square_test(df):
+    """
+    Perform a Chi-Square test to check if entity distributions across labels are significant.
+    """
+    # Create a contingency table of entity types vs. labels
+    contingency_table = pd.crosstab(df["Type"], df["Label"])
+
+    # Perform Chi-Square test
+    chi2, p, dof, expected = stats.chi2_contingency(contingency_table)
+
+    print(f"Chi-Square Statistic: {chi2}")
+    print(f"P-value: {p}")
+    print(f"Degrees of Freedom: {dof}")
+    print("Expected Frequencies Table:")
+    print(pd.DataFrame(expected, index=contingency_table.index, columns=contingency_table.columns))
+
+    if p < 0.05:
+        print("The distribution of entities across labels is statistically significant (p < 0.05).")
+    else:
+        print("The distribution of entities across labels is not statistically significant (p >= 0.05).")
+
+def perform_anova(df):
+    """
+    Perform ANOVA to test if sentiment differences across labels are significant.
+    """
+    # Group sentiment scores by label
+    sentiment_groups = [df[df["Label"] == label]["Sentiment"] for label in df["Label"].unique()]
+
+    # Perform ANOVA
+    f_stat, p_value = stats.f_oneway(*sentiment_groups)
+
+    print(f"F-statistic: {f_stat}")
+    print(f"P-value: {p_value}")
+
+    if p_value < 0.05:
+        print("There are significant differences in sentiment across labels (p < 0.05).")
+    else:
+        print("There are no significant differences in sentiment across labels (p >= 0.05).")
+
+def main(argv=None):
+    args = make_parser("Chi-Square and ANOVA tests of argument component bias", checkpoint=True, store=True).parse_args(argv)
+
+    # Process dataset, scoring sentiment essay by essay so the run can resume,
+    # or load the scores from the results store
+    if args.store:
+        df = load_for(args.store, perform_anova)
+    else:
+        df = process_dataset(args.dataset_path, **run_options(args))
+
+    # Perform Chi-Square test (if entity types are available)
+    # Uncomment the following lines if you have entity types in your dataset
+    # chi_square_test(df)
+
+    # Perform ANOVA
+    perform_anova(df)
+
+if __name__ == "__main__":
+    main()
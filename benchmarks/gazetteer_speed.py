@@ -0,0 +1,104 @@
+"""
+Speed and fallback-rate guard for the gazetteer fast path.
+
+First checks a few known spellings (e.g. "Who" is not the WHO), then runs
+FastEntityExtractor over the dataset's component texts and reports how many
+spans the gazetteer resolved alone and how many needed statistical NER.
+When spaCy and its model are installed it also times the fast path against
+full NER on the same texts and prints their agreement.
+
+Exits with a non-zero status if a spelling check fails or the NER fallback
+rate exceeds --max-fallback.
+
+    python benchmarks/gazetteer_speed.py /path/to/brat-project [--sample 2000] [--max-fallback 0.5]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from argbias.checkpoint import list_essays
+from argbias.common import parse_ann_file
+from argbias.gazetteer import FastEntityExtractor, agreement_report, dataset_vocabulary, sample_texts
+
+TYPES = ["PERSON", "NORP", "GPE", "ORG", "FAC", "GENDER"]
+
+# (text, entities the gazetteer alone should return)
+SPELLING_CHECKS = [
+    ("Who can say that women are wrong", [("women", "GENDER")]),
+    ("Apple pie is American", [("American", "NORP")]),
+    ("The WHO and the UN met in the U.S.", [("WHO", "ORG"), ("UN", "ORG"), ("U.S.", "GPE")]),
+    ("Students from Turkey eat turkey", [("Turkey", "GPE")]),
+    ("Many Americans shop at Amazon", [("Americans", "NORP"), ("Amazon", "ORG")]),
+]
+
+def check_spellings():
+    extractor = FastEntityExtractor(types=TYPES)
+    failures = 0
+    for text, expected in SPELLING_CHECKS:
+        found = extractor(text)
+        status = "ok  " if found == expected else "FAIL"
+        failures += found != expected
+        print(f"{status} {text!r}: {found}")
+    return failures
+
+def component_texts(dataset_path, sample):
+    if sample:
+        return sample_texts(dataset_path, sample)
+    return [ann["text"] for _, _, ann_filepath in list_essays(dataset_path) for ann in parse_ann_file(ann_filepath)]
+
+def timed(extractor, texts):
+    start = time.perf_counter()
+    for text in texts:
+        extractor(text)
+    return time.perf_counter() - start
+
+def load_nlp():
+    try:
+        from argbias.common import get_nlp
+        return get_nlp()
+    except (ImportError, OSError) as error:
+        print(f"spaCy unavailable ({error}); skipping the comparison with full NER")
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset_path", help="Path to the brat-project directory of the dataset")
+    parser.add_argument("--sample", type=int, default=0, help="Sample N components instead of using all of them")
+    parser.add_argument("--max-fallback", type=float, default=0.5,
+                        help="Largest acceptable share of spans sent to NER (default: 0.5)")
+    args = parser.parse_args(argv)
+
+    failures = check_spellings()
+    texts = component_texts(args.dataset_path, args.sample)
+    vocabulary = dataset_vocabulary(args.dataset_path)
+
+    gazetteer_only = FastEntityExtractor(types=TYPES, vocabulary=vocabulary)
+    gazetteer_seconds = timed(gazetteer_only, texts)
+    stats = gazetteer_only.stats
+    fallback_rate = stats["unresolved"] / stats["spans"] if stats["spans"] else 0.0
+    print(f"{stats['spans']} spans: {stats['gazetteer_only']} resolved by the gazetteer alone, "
+          f"{stats['unresolved']} need NER ({fallback_rate:.1%}); gazetteer pass {gazetteer_seconds:.2f} s")
+
+    nlp = load_nlp()
+    if nlp is not None:
+        fast = FastEntityExtractor(nlp=nlp, types=TYPES, vocabulary=vocabulary)
+        fast_seconds = timed(fast, texts)
+        start = time.perf_counter()
+        for text in texts:
+            nlp(text)
+        ner_seconds = time.perf_counter() - start
+        print(f"fast path {fast_seconds:.2f} s ({fast.stats['ner_fallback']} spans through NER), "
+              f"full NER {ner_seconds:.2f} s, speedup {ner_seconds / max(fast_seconds, 1e-9):.1f}x")
+        print(agreement_report(texts, FastEntityExtractor(nlp=nlp, types=TYPES, vocabulary=vocabulary),
+                               nlp, TYPES).to_string(index=False))
+
+    if fallback_rate > args.max_fallback:
+        print(f"FAIL fallback rate {fallback_rate:.1%} exceeds {args.max_fallback:.0%}")
+        failures += 1
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
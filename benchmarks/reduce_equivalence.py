@@ -0,0 +1,102 @@
+"""
+Equivalence guard for the sharded reduce: aggregate a synthetic entity
+table into (Topic, Label, Type) counts, build the final entity tables from
+the counts, and check they are identical to the single-node analyses run on
+one row per occurrence.
+
+Exits with a non-zero status if any table differs. Also reports how long
+each path took.
+
+    python benchmarks/reduce_equivalence.py [--entities 400000]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from argbias.batchtesting import chi_square_tests
+from argbias.biasquantification import calculate_pmi, analyze_entity_influence
+from argbias.ethicalnalysis import analyze_bias
+from argbias.sharding import ENTITY_KEYS, final_tables
+
+LABELS = ["MajorClaim", "Claim", "Premise"]
+TYPES = ["PERSON", "NORP", "GPE", "ORG", "DATE", "CARDINAL", "FAC", "LAW"]
+TOPICS = ["Social Issues", "Economic Issues", "Technology", "Politics", "Other"]
+
+def synthetic_counts(n, seed):
+    """
+    Merged (Topic, Label, Type) counts of ``n`` entity occurrences with skewed type frequencies.
+    """
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(TYPES) + 1)
+    entities = pd.DataFrame({
+        "Topic": rng.choice(TOPICS, size=n),
+        "Label": rng.choice(LABELS, size=n, p=[0.1, 0.3, 0.6]),
+        "Type": rng.choice(TYPES, size=n, p=weights / weights.sum()),
+    })
+    return entities.groupby(ENTITY_KEYS).size().reset_index(name="Count")
+
+def expand_entity_counts(entity_counts):
+    """
+    One row per entity occurrence (Topic, Label, Type), as the single-node analyses expect.
+    """
+    rows = entity_counts.loc[entity_counts.index.repeat(entity_counts["Count"]), ENTITY_KEYS]
+    return rows.reset_index(drop=True)
+
+def single_node_tables(entities):
+    """
+    The entity tables as the single-node analyses compute them.
+    """
+    pmi_scores = calculate_pmi(entities)
+    pmi = pd.DataFrame([(entity, label, score) for (entity, label), score in pmi_scores.items()],
+                       columns=["Entity", "Label", "PMI"])
+    entity_influence, entity_influence_norm = analyze_entity_influence(entities)
+    bias_counts, bias_freq_norm = analyze_bias(entities)
+    return {
+        "entity_label_counts": pd.crosstab(entities["Type"], entities["Label"]),
+        "pmi": pmi.sort_values(["Entity", "Label"], ignore_index=True),
+        "entity_influence": entity_influence,
+        "entity_influence_norm": entity_influence_norm,
+        "bias_counts": bias_counts,
+        "bias_freq_norm": bias_freq_norm,
+        "chi_square": chi_square_tests(entities),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=400000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    entity_counts = synthetic_counts(args.entities, args.seed)
+    moments = pd.DataFrame({"Topic": ["Other"] * 2, "Label": ["Claim", "Premise"],
+                            "Count": [2, 2], "Sum": [0.5, -0.5], "SumSq": [0.25, 0.25]})
+
+    start = time.perf_counter()
+    reduced = final_tables({"entity_counts": entity_counts, "moments": moments})
+    reduce_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = single_node_tables(expand_entity_counts(entity_counts))
+    single_seconds = time.perf_counter() - start
+
+    failures = []
+    for name, table in expected.items():
+        try:
+            pd.testing.assert_frame_equal(reduced[name], table, check_exact=True)
+        except AssertionError as error:
+            failures.append(name)
+            print(f"FAIL {name}: {error}")
+        else:
+            print(f"ok   {name}")
+
+    print(f"{args.entities} entity occurrences in {len(entity_counts)} counts: "
+          f"reduce {reduce_seconds:.2f} s, single-node on expanded rows {single_seconds:.2f} s")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Accuracy guard for the entity sketches: sketch a synthetic Zipf-distributed
+entity stream in several shards, merge them, and check every reported bound
+against exact counts.
+
+Exits with a non-zero status if a true count falls outside
+[LowerBound, Estimate], an overcount exceeds the Space-Saving bound, a
+distinct count is off by more than --max-sigma standard errors, or the
+recall of the exact top entities drops below --min-recall.
+
+    python benchmarks/sketch_accuracy.py [--entities 200000] [--shards 4]
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from argbias.sketches import EntitySketches, error_report
+
+LABELS = ["MajorClaim", "Claim", "Premise"]
+TYPES = ["PERSON", "NORP", "GPE", "ORG", "DATE"]
+TOPICS = ["Social Issues", "Economic Issues", "Technology", "Politics", "Other"]
+
+def synthetic_entities(n, vocabulary, exponent, seed):
+    """
+    ``n`` entity records with Zipf-distributed entity strings and uniform dimensions.
+    """
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(exponent, size=n)
+    ranks = np.where(ranks > vocabulary, rng.integers(1, vocabulary + 1, size=n), ranks)
+    return pd.DataFrame({
+        "Entity": [f"entity-{rank}" for rank in ranks],
+        "Label": rng.choice(LABELS, size=n),
+        "Type": rng.choice(TYPES, size=n),
+        "Topic": rng.choice(TOPICS, size=n),
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=200000)
+    parser.add_argument("--vocabulary", type=int, default=200000)
+    parser.add_argument("--exponent", type=float, default=1.2)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--top", type=int, default=100)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--max-sigma", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = synthetic_entities(args.entities, args.vocabulary, args.exponent, args.seed)
+    shards = [EntitySketches().update_frame(df.iloc[shard::args.shards]) for shard in range(args.shards)]
+    merged = EntitySketches.from_dict(shards[0].to_dict())
+    for shard in shards[1:]:
+        merged.merge(shard)
+
+    report = error_report(merged, df, args.top)
+    failures = report[
+        ~report["WithinBounds"]
+        | (report["MaxOvercount"] > report["CapacityBound"])
+        | (report["DistinctRelativeError"] > args.max_sigma * report["ExpectedRelativeError"])
+        | (report["TopRecall"] < args.min_recall)
+    ]
+    cms_exceeded = int((report["MaxOvercount"] > report["ErrorBound"]).sum())
+
+    pd.set_option("display.width", 200)
+    print(report.to_string(index=False))
+    print(f"{len(report)} sketch keys checked, {len(failures)} failed; "
+          f"Count-Min bound exceeded for {cms_exceeded} (allowed with probability delta each)")
+    return 1 if len(failures) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Startup-time guard: every argbias module must import quickly and without
+loading heavy dependencies.
+
+Each module is imported in a fresh interpreter so timings are not shared.
+Exits with a non-zero status if a module exceeds the budget or pulls in a
+heavy dependency at import time.
+
+    python benchmarks/startup.py [--budget-ms 50] [--repeat 5]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "argbias"
+HEAVY_MODULES = ["spacy", "textblob", "matplotlib", "seaborn", "scipy", "pandas", "numpy", "pyarrow"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+def package_modules():
+    """
+    The package itself plus every module in it.
+    """
+    names = [PACKAGE]
+    for file in sorted(os.listdir(os.path.join(REPO_ROOT, PACKAGE))):
+        if file.endswith(".py") and file != "__init__.py":
+            names.append(f"{PACKAGE}.{file[:-3]}")
+    return names
+
+def measure(module, repeat):
+    """
+    Best-of-``repeat`` import time of ``module`` and the heavy modules it loaded.
+    """
+    best = None
+    heavy = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        best = probe["seconds"] if best is None else min(best, probe["seconds"])
+        heavy = probe["heavy"]
+    return best, heavy
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum import time per module")
+    parser.add_argument("--repeat", type=int, default=5, help="Imports per module (best time is kept)")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in package_modules():
+        seconds, heavy = measure(module, args.repeat)
+        ok = seconds * 1000 <= args.budget_ms and not heavy
+        failures += not ok
+        note = f"  loaded {', '.join(heavy)}" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<50} {seconds * 1000:7.2f} ms{note}")
+
+    if failures:
+        print(f"{failures} module(s) over the {args.budget_ms:.0f} ms budget or loading heavy dependencies")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())